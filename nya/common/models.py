@@ -55,8 +55,11 @@ class ProxyRequest:
 
         # Number of attempts made for this request
         self.attempts: int = 0
-        # Timestamp when added to queue
-        self.added_at: float = time.time()
+        # Monotonic timestamp when added to queue (re-stamped from the
+        # queue's clock on enqueue); only ever compared with other monotonic
+        # readings, so a wall-clock step cannot expire a queued request early
+        # or keep it alive forever
+        self.added_at: float = time.monotonic()
 
         # Whether to apply rate limiting for this request
         self._rate_limited: bool = False
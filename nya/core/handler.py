@@ -35,6 +35,27 @@ class RequestHandler:
             config: Configuration manager instance
         """
         self.config = config
+        # First path segment -> API name. Built on first use; configuration
+        # changes restart the process, so the table never goes stale.
+        self._routes: Optional[Dict[str, str]] = None
+
+    def _route_table(self) -> Dict[str, str]:
+        """
+        Build the lookup table mapping API names and aliases to API names.
+
+        API names take precedence over aliases, and an alias claimed by
+        several APIs resolves to the first one configured.
+        """
+        if self._routes is None:
+            apis_config = self.config.get_apis()
+            routes: Dict[str, str] = {}
+            for endpoint in apis_config:
+                for alias in self.config.get_api_aliases(endpoint):
+                    if isinstance(alias, str):
+                        routes.setdefault(alias.strip("/"), endpoint)
+            routes.update((endpoint, endpoint) for endpoint in apis_config)
+            self._routes = routes
+        return self._routes
 
     def prepare_request(self, request: ProxyRequest) -> None:
         """
@@ -102,7 +123,6 @@ class RequestHandler:
             Tuple of (api_name, remaining_path)
         """
         path = request._url.path
-        apis_config = self.config.get_apis()
 
         # Handle non-API paths or malformed requests
         if not path or not path.startswith(API_PATH_PREFIX):
@@ -116,22 +136,13 @@ class RequestHandler:
             return None, None
 
         # Split into endpoint and trail path
-        parts = api_path.split("/", 1)
-        api_name = parts[0]
-        trail_path = "/" + parts[1] if len(parts) > 1 else "/"
-
-        # Direct match with API name
-        if api_name in apis_config:
-            return api_name, trail_path
-
-        # Check for aliases in each API config
-        for endpoint in apis_config.keys():
-            aliases = self.config.get_api_aliases(endpoint)
-            normalized_aliases = {
-                alias.strip("/") for alias in aliases if isinstance(alias, str)
-            }
-            if api_name in normalized_aliases:
-                return endpoint, trail_path
+        api_name, _, trail = api_path.partition("/")
+        trail_path = "/" + trail
+
+        # Match API names and aliases in a single lookup
+        endpoint = self._route_table().get(api_name)
+        if endpoint is not None:
+            return endpoint, trail_path
 
         # No match found
         logger.warning(f"No API configuration found for endpoint: {api_name}")
@@ -39,13 +39,21 @@ class RequestQueue:
         config: "ConfigManager",
         traffic_manager: "TrafficManager",
         metrics_collector: Optional["MetricsCollector"] = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
         """
         Initialize the simple queue.
+
+        Args:
+            clock: Source of time for queue ages, waits and latencies.
+                Requests are stamped from it when enqueued, so any
+                monotonic source works; tests inject a fixed one instead
+                of sleeping
         """
         self.config = config
         self.control = traffic_manager
         self.metrics_collector = metrics_collector
+        self._now = clock
 
         # Priority queues for each API
         self._queues: Dict[str, asyncio.PriorityQueue] = {}
@@ -78,18 +86,25 @@ class RequestQueue:
         api_name = request.api_name
         request.priority = priority or request.priority
 
-        # Initialize queue and workers if needed
-        await self._setup_endpoint_processor(api_name)
-
-        # Check queue size
-        if self._queues[api_name].qsize() >= self.config.get_api_queue_size(api_name):
+        # Check queue size before touching workers: a zero-size queue rejects
+        # everything, so it must not spin up a worker pool on first use.
+        max_size = self.config.get_api_queue_size(api_name)
+        queue = self._queues.get(api_name)
+        if max_size <= 0 or (queue is not None and queue.qsize() >= max_size):
             raise QueueFullError(api_name=api_name)
 
-        # Create future and attach to request
+        # Initialize queue and workers if needed
+        if queue is None:
+            await self._setup_endpoint_processor(api_name)
+            queue = self._queues[api_name]
+
+        # Create future and attach to request; expiry is measured from here,
+        # on the same clock that later reads it
         request.future = asyncio.Future()
+        request.added_at = self._now()
 
         # Add to queue
-        await self._queues[api_name].put(request)
+        await queue.put(request)
 
         if self.metrics_collector:
             self.metrics_collector.record_queue_hit(api_name)
@@ -123,21 +138,27 @@ class RequestQueue:
             logger.warning(f"No processor registered for {api_name}")
             return
 
+        # The API's queue is created once and never replaced, so resolve it
+        # here rather than on every dispatched request.
+        queue = self._queues[api_name]
+
         while True:
             try:
                 # Get next request (blocks until available)
-                request: "ProxyRequest" = await self._queues[api_name].get()
+                request: "ProxyRequest" = await queue.get()
 
                 # Drop requests the client no longer waits for (timeout or
                 # disconnect cancelled the future) before spending quota.
                 if request.future.done():
                     continue
 
-                # Check if request expired
-                if self._is_request_expired(request):
+                # Check if request expired; one clock read serves both the
+                # check and the reported wait.
+                now = self._now()
+                if self._is_request_expired(request, now):
                     request.future.set_exception(
                         RequestExpiredError(
-                            api_name=api_name, wait_time=time.time() - request.added_at
+                            api_name=api_name, wait_time=now - request.added_at
                         )
                     )
                     continue
@@ -180,7 +201,7 @@ class RequestQueue:
         """
         recorded_hit = False
         logged_wait = False
-        started_waiting = time.time()
+        started_waiting = self._now()
         cond = self.control.get_wait_condition(api_name)
 
         def _wake_on_client_exit(_future) -> None:
@@ -198,9 +219,10 @@ class RequestQueue:
                         if request._rate_limited
                         else 0.0
                     )
-                    remaining = self.config.get_api_queue_expiry(api_name) - (
-                        time.time() - request.added_at
-                    )
+                    # Snapshot the request's age once per pass: the quota
+                    # bound, the expiry check and the reported wait all use it.
+                    waited = self._now() - request.added_at
+                    remaining = self.config.get_api_queue_expiry(api_name) - waited
                     if proxy_wait > max(remaining, 0.0):
                         if not request.future.done():
                             request.future.set_exception(
@@ -225,7 +247,7 @@ class RequestQueue:
                         if logged_wait:
                             logger.debug(
                                 f"Acquired {api_name} key after waiting "
-                                f"{time.time() - started_waiting:.2f}s"
+                                f"{self._now() - started_waiting:.2f}s"
                             )
                         return key
 
@@ -235,13 +257,10 @@ class RequestQueue:
                         self.metrics_collector.record_rate_limit_hit(api_name)
                         recorded_hit = True
 
-                    if request.future.done() or self._is_request_expired(request):
+                    if request.future.done() or remaining < 0:
                         if not request.future.done():
                             request.future.set_exception(
-                                RequestExpiredError(
-                                    api_name=api_name,
-                                    wait_time=time.time() - request.added_at,
-                                )
+                                RequestExpiredError(api_name=api_name, wait_time=waited)
                             )
                         return None
 
@@ -283,7 +302,7 @@ class RequestQueue:
         try:
             # Process the request
             request.attempts += 1
-            started_at = time.time()
+            started_at = self._now()
             response = await self._processor(request)
 
             if request.future.done():
@@ -468,12 +487,16 @@ class RequestQueue:
         request.priority = 1
         await self._queues[request.api_name].put(request)
 
-    def _is_request_expired(self, request: "ProxyRequest") -> bool:
+    def _is_request_expired(
+        self, request: "ProxyRequest", now: Optional[float] = None
+    ) -> bool:
         """
-        Check if request has expired.
+        Check if request has expired, optionally against a caller's clock read.
         """
+        if now is None:
+            now = self._now()
         expiry_seconds = self.config.get_api_queue_expiry(request.api_name)
-        return time.time() - request.added_at > expiry_seconds
+        return now - request.added_at > expiry_seconds
 
     async def clear_queue(self, api_name: str) -> int:
         """
@@ -558,7 +581,7 @@ class RequestQueue:
     ) -> None:
         """Release a successful request once its response body is complete."""
         self.control.get_load_balancer(api_name).record_response_time(
-            api_key, time.time() - started_at
+            api_key, self._now() - started_at
         )
         self.control.unlock_key(api_name, api_key)
 
@@ -38,11 +38,20 @@ class RequestExecutor:
         self,
         config: "ConfigManager",
         metrics_collector: Optional["MetricsCollector"] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         Initialize the simple request executor.
+
+        Args:
+            config: Configuration manager instance
+            metrics_collector: Optional collector for request metrics
+            transport: Optional httpx transport for the upstream client,
+                e.g. ``httpx.MockTransport`` in tests. It replaces the
+                client's own transport, so a configured proxy is bypassed
         """
         self.config = config
+        self._transport = transport
         self.client = self._create_client()
         self.metrics_collector = metrics_collector
         self._close_callbacks = []
@@ -70,6 +79,16 @@ class RequestExecutor:
             if proxy_address:
                 client_kwargs["proxy"] = proxy_address
 
+        if self._transport is not None:
+            # httpx sends everything through an explicit transport and never
+            # consults the proxy, so say so rather than bypass it silently
+            if "proxy" in client_kwargs:
+                logger.warning(
+                    "Custom transport overrides the configured proxy; "
+                    "upstream requests will not use it"
+                )
+            client_kwargs["transport"] = self._transport
+
         return httpx.AsyncClient(**client_kwargs)
 
     async def execute(
@@ -80,7 +99,13 @@ class RequestExecutor:
 
         Any retries are handled by the queue system.
         """
-        actual_start_time = time.time()
+        # Latency is measured on the monotonic clock so wall-clock steps
+        # (NTP slews, manual changes) cannot produce negative durations.
+        started_ns = time.monotonic_ns()
+
+        def elapsed() -> float:
+            return (time.monotonic_ns() - started_ns) / 1e9
+
         api_name = request.api_name
 
         track = bool(self.metrics_collector)
@@ -103,26 +128,28 @@ class RequestExecutor:
                     api_name,
                     request.api_key,
                     0,
-                    time.time() - actual_start_time,
+                    elapsed(),
                     request.trail_path,
                 )
             raise
 
-        # Log request/response details on error response
-        if response.status_code >= 400:
-            logger.debug(f"[Request] Content: {json_safe_dumps(request.content)}")
-
-        logger.debug(
-            f"[Request] Headers: {json_safe_dumps(redact_sensitive_data(request.headers))}"
-        )
-        logger.debug(
-            f"[Response] Headers: {json_safe_dumps(redact_sensitive_data(response.headers))}"
-        )
+        # Redacting, serializing and timing these details is wasted work
+        # unless debug logging will actually emit it
+        if logger.isEnabledFor(logging.DEBUG):
+            # Log request/response details on error response
+            if response.status_code >= 400:
+                logger.debug(f"[Request] Content: {json_safe_dumps(request.content)}")
 
-        logger.debug(
-            f"[Response] URL: {request.url}, Status: {response.status_code} "
-            f"({format_elapsed_time(time.time() - actual_start_time)})"
-        )
+            logger.debug(
+                f"[Request] Headers: {json_safe_dumps(redact_sensitive_data(request.headers))}"
+            )
+            logger.debug(
+                f"[Response] Headers: {json_safe_dumps(redact_sensitive_data(response.headers))}"
+            )
+            logger.debug(
+                f"[Response] URL: {request.url}, Status: {response.status_code} "
+                f"({format_elapsed_time(elapsed())})"
+            )
 
         if detect_streaming_content(response.headers):
             streaming = await handle_streaming_response(response)
@@ -132,7 +159,7 @@ class RequestExecutor:
                         api_name,
                         request.api_key,
                         response.status_code,
-                        time.time() - actual_start_time,
+                        elapsed(),
                         request.trail_path,
                     )
                 )
@@ -146,7 +173,7 @@ class RequestExecutor:
                     api_name,
                     request.api_key,
                     0,
-                    time.time() - actual_start_time,
+                    elapsed(),
                     request.trail_path,
                 )
             raise
@@ -156,7 +183,7 @@ class RequestExecutor:
                 api_name,
                 request.api_key,
                 response.status_code,
-                time.time() - actual_start_time,
+                elapsed(),
                 request.trail_path,
             )
         return result
@@ -3,7 +3,7 @@ Metrics routes: aggregate metrics, per-API metrics, and key-usage stats.
 """
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
@@ -13,6 +13,11 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from ..api import DashboardAPI
 
+# The dashboard polls these routes. Declaring the response model lets FastAPI
+# serialize the snapshot straight to JSON bytes instead of walking it with
+# ``jsonable_encoder`` and the stdlib encoder; error responses pass through.
+_SNAPSHOT_MODEL = Dict[str, Any]
+
 
 def _no_collector() -> JSONResponse:
     """503 response used when the metrics collector is not wired in."""
@@ -24,7 +29,7 @@ def _no_collector() -> JSONResponse:
 def register_metrics_routes(app: FastAPI, dashboard: "DashboardAPI") -> None:
     """Attach the metrics and key-usage routes to ``app``."""
 
-    @app.get("/api/metrics")
+    @app.get("/api/metrics", response_model=_SNAPSHOT_MODEL)
     async def get_metrics():
         """Get all metrics as JSON."""
         if not dashboard.metrics_collector:
@@ -38,7 +43,7 @@ def register_metrics_routes(app: FastAPI, dashboard: "DashboardAPI") -> None:
                 content={"error": f"Error retrieving metrics: {str(e)}"},
             )
 
-    @app.get("/api/metrics/{api_name}")
+    @app.get("/api/metrics/{api_name}", response_model=_SNAPSHOT_MODEL)
     async def get_api_metrics(api_name: str):
         """Get metrics for a specific API."""
         if not dashboard.metrics_collector:
@@ -58,7 +63,7 @@ def register_metrics_routes(app: FastAPI, dashboard: "DashboardAPI") -> None:
                 content={"error": f"Error retrieving API metrics: {str(e)}"},
             )
 
-    @app.get("/api/key-usage")
+    @app.get("/api/key-usage", response_model=_SNAPSHOT_MODEL)
     async def get_key_usage():
         """Get API key usage statistics."""
         if not dashboard.metrics_collector:
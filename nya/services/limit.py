@@ -2,11 +2,12 @@
 Simple rate limiting with time-based recovery.
 """
 
+import functools
 import logging
 import re
 import time
 from collections import deque
-from typing import Any, Deque, Dict, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 
 from ..common.exceptions import ConfigurationError
 
@@ -30,21 +31,42 @@ class RateLimiter:
         "d": 86400,
     }
 
-    def __init__(self, rate_limit: Optional[str] = None):
+    # "<requests>/<unit>" or the compound "<requests>/<multiplier><unit>",
+    # compiled once for every limiter the traffic manager creates.
+    _RATE_LIMIT_PATTERN = re.compile(r"^(\d+)/(\d*)([smhd])$")
+
+    def __init__(
+        self,
+        rate_limit: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.monotonic,
+    ):
         """
         Initialize rate limiter.
 
         Args:
             rate_limit: Rate limit string (e.g., "10/m", "1/5s")
+            clock: Source of the current wall-clock time in seconds; tests
+                inject a controllable one instead of sleeping
+            monotonic: Source of monotonic time for the process-local
+                concurrency lock, which is never persisted
         """
+        self._clock = clock
+        self._monotonic = monotonic
         self.rate_limit = rate_limit or "0/s"
         self.requests_limit, self.window_seconds = self._parse_rate_limit(rate_limit)
+        # With no request window there is nothing to count, so the
+        # per-request paths skip the timestamp bookkeeping entirely.
+        self._unlimited = not (self.requests_limit and self.window_seconds)
         self.request_timestamps: Deque[float] = deque()
-        self.last_accessed = time.time()
+        self.last_accessed = self._clock()
 
         # Deadline for the concurrency lock, or None when unlocked. A lock
         # that could not expire took a credential out of rotation for the
-        # lifetime of the process whenever a release was missed.
+        # lifetime of the process whenever a release was missed. It is kept
+        # on the monotonic clock so a wall-clock step cannot stretch or cut
+        # short a lock; the window and cool-down stay on wall time because
+        # they are persisted across restarts.
         self._locked_until: Optional[float] = None
         # Explicit cool-down deadline (block_for), independent of the
         # request-window limit so it also works on unlimited limiters.
@@ -53,7 +75,9 @@ class RateLimiter:
     def __repr__(self):
         return f"<RateLimiter rate_limit={self.rate_limit}>"
 
-    def _parse_rate_limit(self, rate_limit: Optional[str]) -> Tuple[int, int]:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _parse_rate_limit(rate_limit: Optional[str]) -> Tuple[int, int]:
         """
         Parse a rate limit string into ``(requests, window_seconds)``.
 
@@ -61,28 +85,18 @@ class RateLimiter:
         value that does not match a supported format raises
         ``ConfigurationError`` so a typo cannot silently disable rate
         limiting.
+
+        A deployment uses a handful of distinct limits across many
+        per-key limiters, so results are memoized; errors are not cached.
         """
         if not rate_limit or rate_limit == "0":
             return 0, 0
 
-        # Try compound format first (e.g., "1/10s")
-        compound_pattern = r"^(\d+)/(\d+)([smhd])$"
-        compound_match = re.match(compound_pattern, rate_limit)
-
-        if compound_match:
-            requests = int(compound_match.group(1))
-            multiplier = int(compound_match.group(2))
-            unit = compound_match.group(3)
-            return requests, multiplier * self.TIME_UNITS[unit]
-
-        # Simple format (e.g., "100/m")
-        simple_pattern = r"^(\d+)/([smhd])$"
-        simple_match = re.match(simple_pattern, rate_limit)
-
-        if simple_match:
-            requests = int(simple_match.group(1))
-            unit = simple_match.group(2)
-            return requests, self.TIME_UNITS[unit]
+        # Simple (e.g., "100/m") or compound (e.g., "1/10s") format
+        match = RateLimiter._RATE_LIMIT_PATTERN.match(rate_limit)
+        if match:
+            requests, multiplier, unit = match.groups()
+            return int(requests), int(multiplier or 1) * RateLimiter.TIME_UNITS[unit]
 
         raise ConfigurationError(
             [
@@ -101,13 +115,10 @@ class RateLimiter:
         if self.locked:
             return True
 
-        if time.time() < self.blocked_until:
+        if self._clock() < self.blocked_until:
             return True
 
-        if self.requests_limit == 0:
-            return False
-
-        if self.window_seconds == 0:
+        if self._unlimited:
             return False
 
         self._clean_old_timestamps()
@@ -116,15 +127,20 @@ class RateLimiter:
     def record(self) -> None:
         """
         Record a request timestamp.
+
+        Unlimited limiters record nothing: they never trim their window, so
+        every request would otherwise grow the deque for the process lifetime.
         """
         self.touch()
-        self.request_timestamps.append(time.time())
+        if self._unlimited:
+            return
+        self.request_timestamps.append(self._clock())
 
     def touch(self) -> None:
         """
         Update the last access timestamp for cache eviction.
         """
-        self.last_accessed = time.time()
+        self.last_accessed = self._clock()
 
     def release(self) -> None:
         """
@@ -147,7 +163,7 @@ class RateLimiter:
         """
         if self._locked_until is None:
             return False
-        if time.time() >= self._locked_until:
+        if self._monotonic() >= self._locked_until:
             self._locked_until = None
             logger.warning(
                 "Concurrency lock on %r expired without being released; "
@@ -164,7 +180,7 @@ class RateLimiter:
         self.touch()
         if ttl is None or ttl <= 0:
             ttl = DEFAULT_LOCK_TTL_SECONDS
-        self._locked_until = time.time() + ttl
+        self._locked_until = self._monotonic() + ttl
 
     def unlock(self) -> None:
         """
@@ -183,7 +199,7 @@ class RateLimiter:
         """
         if self._locked_until is None:
             return 0.0
-        return max(0.0, self._locked_until - time.time())
+        return max(0.0, self._locked_until - self._monotonic())
 
     def block_for(self, duration: float) -> None:
         """
@@ -191,13 +207,13 @@ class RateLimiter:
         retryable upstream status). Works even when no rate limit is set.
         """
         self.touch()
-        self.blocked_until = max(self.blocked_until, time.time() + duration)
+        self.blocked_until = max(self.blocked_until, self._clock() + duration)
 
     def _clean_old_timestamps(self, current_time: Optional[float] = None) -> None:
         """
         Remove timestamps outside current window.
         """
-        current_time = current_time or time.time()
+        current_time = current_time or self._clock()
         window_start = current_time - self.window_seconds
         while self.request_timestamps and self.request_timestamps[0] < window_start:
             self.request_timestamps.popleft()
@@ -210,7 +226,7 @@ class RateLimiter:
         if not self.is_limited():
             return 0.0
 
-        current_time = time.time()
+        current_time = self._clock()
         blocked_wait = max(0.0, self.blocked_until - current_time)
 
         # A locked limiter has no natural reset time and may hold no
@@ -239,7 +255,7 @@ class RateLimiter:
         is deliberately excluded: it tracks in-flight concurrency for a
         process that is going away, so restoring it would strand a key.
         """
-        now = time.time()
+        now = self._clock()
         if self.window_seconds:
             timestamps = [
                 t for t in self.request_timestamps if now - t < self.window_seconds
@@ -264,7 +280,7 @@ class RateLimiter:
         in the future are dropped: a backwards clock change or a hand-edited
         state file must not be able to hold a limiter shut indefinitely.
         """
-        now = time.time()
+        now = self._clock()
         timestamps = []
         for raw in state.get("timestamps") or []:
             try:
@@ -9,8 +9,9 @@ bounded ring buffer of recent requests, used purely for the dashboard's
 """
 
 import time
-from collections import defaultdict, deque
-from typing import Any, Deque, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from prometheus_client import (
     CONTENT_TYPE_LATEST,
@@ -30,6 +31,10 @@ PROMETHEUS_CONTENT_TYPE = CONTENT_TYPE_LATEST
 #: Latency histogram buckets, in seconds.
 _LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 
+#: Status-class labels reported per API; codes outside 100-599 (including the
+#: transport-failure sentinel 0) are counted as "other".
+_STATUS_CLASSES = ("other", "1xx", "2xx", "3xx", "4xx", "5xx")
+
 #: Number of recent request/response events kept for the dashboard log.
 _HISTORY_SIZE = 2000
 
@@ -44,6 +49,50 @@ _M_QUEUE = "nyaproxy_queue_hits"
 _M_KEY = "nyaproxy_key_requests"
 
 
+class _LazyChild:
+    """
+    A labelled metric child that is created the first time it is used.
+
+    ``prometheus_client`` exports every child it has created, so binding all
+    of an API's children up front would publish zero-valued series for
+    metrics that were never recorded.
+    """
+
+    __slots__ = ("_metric", "_labels", "_child")
+
+    def __init__(self, metric: Any, **labels: str) -> None:
+        self._metric = metric
+        self._labels = labels
+        self._child: Any = None
+
+    def get(self) -> Any:
+        """Return the child, creating it through ``labels()`` on first use."""
+        child = self._child
+        if child is None:
+            child = self._child = self._metric.labels(**self._labels)
+        return child
+
+
+@dataclass(slots=True)
+class _ApiInstruments:
+    """
+    Labelled metric children for one API.
+
+    Resolving a child through ``labels()`` takes the metric's lock and a dict
+    lookup, so the write path resolves each API's children once, on first
+    use, and reuses them.
+    """
+
+    requests: _LazyChild
+    active: _LazyChild
+    duration: _LazyChild
+    rate_limit_hits: _LazyChild
+    queue_hits: _LazyChild
+    responses: Dict[int, Counter] = field(default_factory=dict)
+    #: Raw API key -> (masked key id, per-key request counter).
+    keys: Dict[Optional[str], Tuple[str, _LazyChild]] = field(default_factory=dict)
+
+
 def _blank_api() -> Dict[str, Any]:
     """Zero-valued metric bucket for one API."""
     return {
@@ -68,7 +117,7 @@ class MetricsCollector:
     """
 
     def __init__(self) -> None:
-        self.start_time = time.time()
+        self._started_ns = time.monotonic_ns()
         self.registry = CollectorRegistry()
         self.request_history: Deque[Dict[str, Any]] = deque(maxlen=_HISTORY_SIZE)
 
@@ -76,6 +125,9 @@ class MetricsCollector:
         # never has to scan the history ring buffer.
         self._last_request: Dict[str, float] = {}
 
+        # Labelled children per API; dropped by ``reset`` with the metrics.
+        self._instruments: Dict[str, _ApiInstruments] = {}
+
         self._requests = Counter(
             _M_REQUESTS,
             "Total requests received, by API.",
@@ -132,12 +184,13 @@ class MetricsCollector:
         label: paths are unbounded, and one label per distinct path would grow
         the metric series without limit.
         """
-        key_id = mask_secret(api_key)
         now = time.time()
 
-        self._requests.labels(api=api_name).inc()
-        self._active.labels(api=api_name).inc()
-        self._key_requests.labels(api=api_name, key=key_id).inc()
+        instruments = self._api_instruments(api_name)
+        key_id, key_requests = self._key_instruments(api_name, instruments, api_key)
+        instruments.requests.get().inc()
+        instruments.active.get().inc()
+        key_requests.get().inc()
         self._last_request[api_name] = now
 
         self.request_history.append(
@@ -159,15 +212,21 @@ class MetricsCollector:
         path: Optional[str] = None,
     ) -> None:
         """Record a response received from an upstream API."""
-        self._responses.labels(api=api_name, status=str(status_code)).inc()
-        self._duration.labels(api=api_name).observe(elapsed)
-        self._active.labels(api=api_name).dec()
+        instruments = self._api_instruments(api_name)
+        key_id, _ = self._key_instruments(api_name, instruments, api_key)
+        responses = instruments.responses.get(status_code)
+        if responses is None:
+            responses = self._responses.labels(api=api_name, status=str(status_code))
+            instruments.responses[status_code] = responses
+        responses.inc()
+        instruments.duration.get().observe(elapsed)
+        instruments.active.get().dec()
 
         self.request_history.append(
             {
                 "type": "response",
                 "api_name": api_name,
-                "key_id": mask_secret(api_key),
+                "key_id": key_id,
                 "status_code": status_code,
                 "elapsed_ms": elapsed * 1000,
                 "path": path or "/",
@@ -177,11 +236,11 @@ class MetricsCollector:
 
     def record_rate_limit_hit(self, api_name: str) -> None:
         """Record a request being rejected or delayed by a rate limit."""
-        self._rate_limit_hits.labels(api=api_name).inc()
+        self._api_instruments(api_name).rate_limit_hits.get().inc()
 
     def record_queue_hit(self, api_name: str) -> None:
         """Record a request being routed through the queue."""
-        self._queue_hits.labels(api=api_name).inc()
+        self._api_instruments(api_name).queue_hits.get().inc()
 
     # ------------------------------------------------------------------ read
 
@@ -221,6 +280,7 @@ class MetricsCollector:
                 "queue_hits": summary["queue_hits"],
                 "last_request_time": self._last_request.get(api_name),
                 "responses": summary["status_codes"],
+                "status_classes": summary["status_classes"],
                 "key_usage": {
                     key_id: data["total"] for key_id, data in summary["keys"].items()
                 },
@@ -232,7 +292,7 @@ class MetricsCollector:
                 "total_errors": total_errors,
                 "total_rate_limit_hits": total_rate_limit_hits,
                 "total_queue_hits": total_queue_hits,
-                "uptime_seconds": time.time() - self.start_time,
+                "uptime_seconds": (time.monotonic_ns() - self._started_ns) / 1e9,
             },
             "apis": apis,
             "timestamp": time.time(),
@@ -252,20 +312,55 @@ class MetricsCollector:
             metric.clear()
         self.request_history.clear()
         self._last_request.clear()
-        self.start_time = time.time()
+        self._instruments.clear()
+        self._started_ns = time.monotonic_ns()
 
     # --------------------------------------------------------------- private
 
+    def _api_instruments(self, api_name: str) -> _ApiInstruments:
+        """Return the cached labelled metric children for ``api_name``."""
+        instruments = self._instruments.get(api_name)
+        if instruments is None:
+            instruments = _ApiInstruments(
+                requests=_LazyChild(self._requests, api=api_name),
+                active=_LazyChild(self._active, api=api_name),
+                duration=_LazyChild(self._duration, api=api_name),
+                rate_limit_hits=_LazyChild(self._rate_limit_hits, api=api_name),
+                queue_hits=_LazyChild(self._queue_hits, api=api_name),
+            )
+            self._instruments[api_name] = instruments
+        return instruments
+
+    def _key_instruments(
+        self, api_name: str, instruments: _ApiInstruments, api_key: Optional[str]
+    ) -> Tuple[str, _LazyChild]:
+        """
+        Return the masked id and request counter for one API key.
+
+        Keys are a small, fixed set per API, so the masked id is computed once
+        per key instead of on every request. The counter child is only
+        created when ``record_request`` counts the key, so a key seen solely
+        on the response path exports no ``key_requests`` series.
+        """
+        entry = instruments.keys.get(api_key)
+        if entry is None:
+            key_id = mask_secret(api_key)
+            entry = (key_id, _LazyChild(self._key_requests, api=api_name, key=key_id))
+            instruments.keys[api_key] = entry
+        return entry
+
     def _snapshot(self) -> Dict[str, Dict[str, Any]]:
         """Collect every metric into a per-API dict in a single pass."""
-        apis: Dict[str, Dict[str, Any]] = defaultdict(_blank_api)
+        apis: Dict[str, Dict[str, Any]] = {}
 
         for metric in self.registry.collect():
             for sample in metric.samples:
                 api = sample.labels.get("api")
                 if api is None:
                     continue
-                bucket = apis[api]
+                bucket = apis.get(api)
+                if bucket is None:
+                    bucket = apis[api] = _blank_api()
                 name, value = sample.name, sample.value
 
                 if name == f"{_M_REQUESTS}_total":
@@ -290,10 +385,20 @@ class MetricsCollector:
     @staticmethod
     def _format_api(bucket: Dict[str, Any]) -> Dict[str, Any]:
         """Turn one raw metric bucket into a formatted API summary."""
-        status_codes = {int(code): int(n) for code, n in bucket["responses"].items()}
-        success = sum(n for code, n in status_codes.items() if 200 <= code < 300)
-        # Status 0 is the sentinel for a transport failure (no HTTP response).
-        errors = sum(n for code, n in status_codes.items() if code >= 400 or code == 0)
+        # Rates are derived here, on read, from the raw counters; the write
+        # path only ever increments.
+        status_codes: Dict[int, int] = {}
+        class_counts = [0] * len(_STATUS_CLASSES)
+        success = errors = 0
+        for raw_code, raw_count in bucket["responses"].items():
+            code, n = int(raw_code), int(raw_count)
+            status_codes[code] = n
+            class_counts[code // 100 if 100 <= code < 600 else 0] += n
+            if 200 <= code < 300:
+                success += n
+            # Status 0 is the sentinel for a transport failure (no HTTP response).
+            elif code >= 400 or code == 0:
+                errors += n
 
         handled = success + errors
         success_rate = (success / handled * 100) if handled else 100.0
@@ -309,6 +414,7 @@ class MetricsCollector:
             "success_rate": success_rate,
             "avg_response_time": avg_ms,
             "status_codes": status_codes,
+            "status_classes": dict(zip(_STATUS_CLASSES, class_counts)),
             "rate_limit_hits": int(bucket["rate_limit_hits"]),
             "queue_hits": int(bucket["queue_hits"]),
             "keys": {
@@ -10,6 +10,14 @@ import orjson
 
 __all__ = ["json_safe_dumps", "format_elapsed_time"]
 
+_ORJSON_INDENT_2_OPTIONS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+)
+
 
 def json_safe_dumps(
     obj: Any, indent: Optional[int] = 4, ensure_ascii: bool = False
@@ -22,7 +30,7 @@ def json_safe_dumps(
 
     Args:
         obj: The Python object to convert to JSON
-        indent: Number of spaces for indentation (pretty-printing)
+        indent: Number of spaces to indent by, or None for a single line
         ensure_ascii: If True, escape all non-ASCII characters
 
     Returns:
@@ -36,23 +44,40 @@ def json_safe_dumps(
     if isinstance(obj, Mapping):
         obj = dict(obj)
 
-    def bytes_converter(o: Any) -> Any:
-        if isinstance(o, bytes):
-            try:
-                return orjson.loads(o)
-            except UnicodeDecodeError:
-                return f"<binary data: {len(o)} bytes>"
-        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+    # orjson can only indent by two spaces, so only that layout uses it;
+    # every other layout, ASCII escaping and anything orjson rejects (e.g.
+    # integers beyond 64 bits) take the stdlib path. Datetimes, dataclasses
+    # and subclasses are passed through to the same fallback as the stdlib.
+    # Its output otherwise matches json.dumps(indent=2) except that NaN and
+    # Infinity become null, exponent floats drop zero padding (1e-7, not
+    # 1e-07), and UUIDs and plain Enum members are encoded natively instead
+    # of falling back to str(obj).
+    if indent == 2 and not ensure_ascii:
+        try:
+            return orjson.dumps(
+                obj, default=_bytes_converter, option=_ORJSON_INDENT_2_OPTIONS
+            ).decode()
+        except orjson.JSONEncodeError:
+            pass
 
     # Pretty-print JSON with indentation and optional ASCII escaping
     try:
         return json.dumps(
-            obj, indent=indent, ensure_ascii=ensure_ascii, default=bytes_converter
+            obj, indent=indent, ensure_ascii=ensure_ascii, default=_bytes_converter
         )
     except Exception:
         return str(obj)
 
 
+def _bytes_converter(o: Any) -> Any:
+    if isinstance(o, bytes):
+        try:
+            return orjson.loads(o)
+        except UnicodeDecodeError:
+            return f"<binary data: {len(o)} bytes>"
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
 def format_elapsed_time(elapsed_seconds: float) -> str:
     """
     Format elapsed time in a human-readable format.
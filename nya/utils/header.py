@@ -2,10 +2,11 @@
 Header processing utilities for NyaProxy.
 """
 
+import functools
 import ipaddress
 import logging
 import re
-from typing import Any, Dict, Iterable, Optional, Set, Union
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Union
 
 from httpx import Headers
 
@@ -112,15 +113,15 @@ class HeaderUtils:
         Returns:
             Set of variable names required by the templates
         """
-        required_vars = set()
+        required_vars: Set[str] = set()
 
         for header_value in header_templates.values():
             if not isinstance(header_value, str):
                 continue
 
             # Find all ${{variable}} patterns in header templates
-            for match in HeaderUtils._VARIABLE_PATTERN.finditer(header_value):
-                required_vars.add(match.group(1).strip())
+            _, variables = HeaderUtils._compile_template(header_value)
+            required_vars.update(name for name, _ in variables)
 
         return required_vars
 
@@ -142,38 +143,70 @@ class HeaderUtils:
             Processed headers with variables substituted
         """
 
-        # Use CaseInsensitiveDict to maintain case-insensitive lookups but preserve original case
-        final_headers = Headers()
+        # Render the templates first so overridden originals can be skipped
+        # and the result built in one pass; assigning into ``Headers`` one
+        # key at a time rescans the whole header list on every write.
+        overrides: Dict[str, Tuple[str, str]] = {}
+        for header_name, template in header_templates.items():
+            if template is None:
+                continue
 
-        # Start with original headers, filtering out excluded ones
+            # Convert template to string if it's not already
+            template_str = str(template) if not isinstance(template, str) else template
+
+            # Replace variables in the template
+            overrides[header_name.lower()] = (
+                header_name,
+                HeaderUtils._substitute_variables(template_str, variable_values),
+            )
+
+        # Keyed case-insensitively; values keep the original casing
+        merged: Dict[str, Tuple[str, str]] = {}
         if original_headers:
             for k, v in original_headers.items():
+                lowered = k.lower()
                 # Authorization authenticates the caller *to NyaProxy*. Never
                 # pass it through implicitly: APIs that use upstream bearer
                 # auth add a fresh Authorization value via ``header_templates``.
                 if (
-                    k.lower() not in HeaderUtils._EXCLUDED_HEADERS
-                    and k.lower() != "authorization"
+                    lowered not in HeaderUtils._EXCLUDED_HEADERS
+                    and lowered != "authorization"
                 ):
-                    final_headers[k] = v  # This preserves the original case
+                    merged[lowered] = (k, v)
 
-        # Process each header template
-        for header_name, template in header_templates.items():
-            if template is None:
-                continue
+        # Templates win, replacing an original header in place
+        merged.update(overrides)
 
-            # Convert template to string if it's not already
-            template_str = str(template) if not isinstance(template, str) else template
+        return Headers(list(merged.values()))
 
-            # Replace variables in the template
-            header_value = HeaderUtils._substitute_variables(
-                template_str, variable_values
-            )
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_template(
+        template: str,
+    ) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+        """
+        Split a header template into literal text and variable references.
 
-            # Set header with original casing preserved
-            final_headers[header_name] = header_value
+        Header templates are fixed for the life of the process, so each one
+        is scanned once and every request only concatenates the pieces.
 
-        return final_headers
+        Args:
+            template: Template string with variables
+
+        Returns:
+            Tuple of (literals, variables) where variables holds
+            (name, placeholder) pairs and literals has one more entry, the
+            text surrounding each placeholder
+        """
+        literals = []
+        variables = []
+        position = 0
+        for match in HeaderUtils._VARIABLE_PATTERN.finditer(template):
+            literals.append(template[position : match.start()])
+            variables.append((match.group(1).strip(), match.group(0)))
+            position = match.end()
+        literals.append(template[position:])
+        return tuple(literals), tuple(variables)
 
     @staticmethod
     def _substitute_variables(
@@ -192,27 +225,22 @@ class HeaderUtils:
         """
 
         # Quick check if there are any variables to substitute
-        if not HeaderUtils._VARIABLE_PATTERN.search(template):
+        if "${{" not in template:
             return template
 
-        # Find all matches and process from end to start to avoid position shifts
-        matches = list(HeaderUtils._VARIABLE_PATTERN.finditer(template))
-        result = template
-
-        for match in reversed(matches):
-            var_name = match.group(1).strip()
-            start, end = match.span()
-
+        literals, variables = HeaderUtils._compile_template(template)
+        parts = [literals[0]]
+        for (var_name, placeholder), literal in zip(variables, literals[1:]):
             if var_name in variable_values:
-                value = HeaderUtils._get_variable_value(variable_values[var_name])
-                # Replace just this match
-                result = result[:start] + value + result[end:]
+                parts.append(HeaderUtils._get_variable_value(variable_values[var_name]))
             else:
                 logger.warning(
                     f"Variable '{var_name}' not found in variable values {variable_values}"
                 )
+                parts.append(placeholder)
+            parts.append(literal)
 
-        return result
+        return "".join(parts)
 
     @staticmethod
     def _get_variable_value(value: Any) -> str:
@@ -6,19 +6,26 @@ rules and conditionally mutates a JSON body. Everything else in this module
 is an internal helper for that engine.
 """
 
+import functools
 import json
 import logging
+import operator
 import re
-from typing import Any, Dict, List, Union
+import sys
+from typing import Any, Callable, Dict, Hashable, List, Tuple, Union
 
 import jmespath
 import orjson
 from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["apply_body_substitutions"]
 
+# A ``${{path}}`` reference to the original body inside a string value
+_REFERENCE_PATTERN = re.compile(r"\$\{\{([^}]*)\}\}")
+
 
 def apply_body_substitutions(
     body: Union[Dict, List, str, bytes], rules: List[Dict]
@@ -45,9 +52,15 @@ def apply_body_substitutions(
                }
 
     Returns:
-        The modified JSON body as a dict or list
+        The modified JSON body as a dict or list. A dict or list passed in
+        is left untouched; the rules are applied to a copy of it.
     """
-    # If body is a string, parse it to a dict
+    # Nothing to apply: hand the body back without decoding it
+    if not rules:
+        return body
+
+    # If body is a string, parse it to a dict; the decoded copy is ours to edit
+    decoded = False
     if isinstance(body, str) or isinstance(body, bytes):
         try:
             body = orjson.loads(body)
@@ -55,12 +68,22 @@ def apply_body_substitutions(
             # If the body isn't valid JSON, return it unchanged
             logger.warning("Failed to decode body as JSON, returning unchanged.")
             return body
+        decoded = True
 
-    # If no rules or body isn't a dict/list, return unchanged
-    if not rules or not isinstance(body, (dict, list)):
+    # If body isn't a dict/list, return unchanged
+    if not isinstance(body, (dict, list)):
         return body
 
-    result = body
+    # Copy the caller's body once; every rule below then edits the copy in
+    # place. A body that cannot round-trip through JSON could never be
+    # modified by a rule, so it is returned as-is.
+    if decoded:
+        result = body
+    else:
+        try:
+            result = orjson.loads(orjson.dumps(body))
+        except TypeError:
+            return body
 
     # Apply each rule in sequence
     for rule in rules:
@@ -109,146 +132,23 @@ def _check_rule_conditions(body: Union[Dict, List], conditions: List[Dict]) -> b
     Returns:
         True if all conditions are met, False otherwise
     """
-    for condition in conditions:
-        if not all(k in condition for k in ["field", "operator"]):
-            continue  # Skip malformed conditions
-
+    # Conditions on the same field share one compiled search; resolve each
+    # field once per check rather than once per condition.
+    found: Dict[Callable[[Any], Any], Any] = {}
+    for search, predicate in _compiled_conditions(conditions):
         try:
-            field_path = condition["field"]
-            operator = condition["operator"]
-
             # Extract the value at the specified path
-            try:
-                field_value = jmespath.search(field_path, body)
-                field_exists = field_value is not None or jmespath.search(
-                    f"length({field_path}) > `0`", body
-                )
-            except (JMESPathError, KeyError, IndexError):
-                field_value = None
-                field_exists = False
-
-            # Now evaluate the condition based on the operator
-            if operator == "eq" and "value" in condition:
-                if field_value != condition["value"]:
-                    return False
-
-            elif operator == "ne" and "value" in condition:
-                if field_value == condition["value"]:
-                    return False
-
-            elif operator == "gt" and "value" in condition:
-                if (
-                    not isinstance(field_value, (int, float))
-                    or field_value <= condition["value"]
-                ):
-                    return False
-
-            elif operator == "lt" and "value" in condition:
-                if (
-                    not isinstance(field_value, (int, float))
-                    or field_value >= condition["value"]
-                ):
-                    return False
-
-            elif operator == "ge" and "value" in condition:
-                if (
-                    not isinstance(field_value, (int, float))
-                    or field_value < condition["value"]
-                ):
-                    return False
-
-            elif operator == "le" and "value" in condition:
-                if (
-                    not isinstance(field_value, (int, float))
-                    or field_value > condition["value"]
-                ):
-                    return False
-
-            elif operator == "in" and "value" in condition:
-                if (
-                    not isinstance(condition["value"], (list, tuple))
-                    or field_value not in condition["value"]
-                ):
-                    return False
-
-            elif operator == "nin" and "value" in condition:
-                if (
-                    not isinstance(condition["value"], (list, tuple))
-                    or field_value in condition["value"]
-                ):
-                    return False
-
-            elif operator == "like" and "value" in condition:
-                if not isinstance(field_value, str) or not _like_match(
-                    field_value, str(condition["value"])
-                ):
-                    return False
-
-            elif operator == "nlike" and "value" in condition:
-                if not isinstance(field_value, str) or _like_match(
-                    field_value, str(condition["value"])
-                ):
-                    return False
-
-            elif operator == "contains" and "value" in condition:
-                if not _contains_value(field_value, condition["value"]):
-                    return False
-
-            elif operator == "ncontains" and "value" in condition:
-                if _contains_value(field_value, condition["value"]):
-                    return False
-
-            elif operator == "between" and "value" in condition:
-                if (
-                    not isinstance(condition["value"], (list, tuple))
-                    or len(condition["value"]) != 2
-                ):
-                    return False
-                if not isinstance(field_value, (int, float)) or not (
-                    condition["value"][0] <= field_value <= condition["value"][1]
-                ):
-                    return False
-
-            elif operator == "nbetween" and "value" in condition:
-                if (
-                    not isinstance(condition["value"], (list, tuple))
-                    or len(condition["value"]) != 2
-                ):
-                    return False
-                if not isinstance(field_value, (int, float)) or (
-                    condition["value"][0] <= field_value <= condition["value"][1]
-                ):
-                    return False
-
-            elif operator == "startswith" and "value" in condition:
-                if not isinstance(field_value, str) or not field_value.startswith(
-                    str(condition["value"])
-                ):
-                    return False
-
-            elif operator == "endswith" and "value" in condition:
-                if not isinstance(field_value, str) or not field_value.endswith(
-                    str(condition["value"])
-                ):
-                    return False
-
-            elif operator == "exists":
-                if not field_exists:
-                    return False
-
-            elif operator == "nexists":
-                if field_exists:
-                    return False
-
-            elif operator == "isnull":
-                # Simply check if the field value is None (null in JSON)
-                if field_value is not None:
-                    return False
-
-            elif operator == "notnull":
-                # Simply check if the field value is not None
-                if field_value is None:
-                    return False
+            if search in found:
+                field_value = found[search]
+            else:
+                try:
+                    field_value = search(body)
+                except (JMESPathError, KeyError, IndexError):
+                    field_value = None
+                found[search] = field_value
+
+            if not predicate(field_value):
+                return False
 
         except Exception:
             # If evaluation fails, consider the condition not met
@@ -258,6 +158,277 @@ def _check_rule_conditions(body: Union[Dict, List], conditions: List[Dict]) -> b
     return True
 
 
+_Condition = Tuple[Callable[[Any], Any], Callable[[Any], bool]]
+_PredicateBuilder = Callable[[Any], Callable[[Any], bool]]
+
+
+# Compiled conditions by the identity of the list they came from. Each entry
+# holds the list itself, so its id cannot be reused while the entry lives.
+# Configuration is replaced, not edited in place, when it reloads, so a
+# cached list never changes under its compiled form.
+_COMPILED_BY_ID: Dict[int, Tuple[List[Dict], Tuple[_Condition, ...]]] = {}
+_COMPILED_BY_ID_SIZE = 256
+
+
+def _compiled_conditions(conditions: List[Dict]) -> Tuple[_Condition, ...]:
+    """
+    Compile a rule's conditions, reusing the result for identical lists.
+
+    Rules come from configuration and are evaluated for every request, so
+    the JMESPath expressions and operator dispatch are resolved once per
+    distinct condition list rather than once per request. The same list
+    object is found by identity; building the exact value key is left to
+    the first sighting of each list.
+    """
+    entry = _COMPILED_BY_ID.get(id(conditions))
+    if entry is not None and entry[0] is conditions:
+        return entry[1]
+
+    try:
+        key = _condition_key(conditions)
+    except TypeError:
+        # Holds an unhashable or unorderable value: compile this list alone
+        compiled = _compile_conditions(conditions)
+    else:
+        compiled = _compile_conditions_from_key(key)
+
+    if len(_COMPILED_BY_ID) >= _COMPILED_BY_ID_SIZE:
+        _COMPILED_BY_ID.clear()
+    _COMPILED_BY_ID[id(conditions)] = (conditions, compiled)
+    return compiled
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_conditions_from_key(key: Hashable) -> Tuple[_Condition, ...]:
+    return _compile_conditions(_condition_from_key(key))
+
+
+def _condition_key(value: Any) -> Hashable:
+    """
+    Build a hashable key that identifies ``value`` exactly.
+
+    Every value is tagged with its type, so ``1``, ``1.0`` and ``True``, or
+    a list and a tuple, stay distinct. Floats are keyed by ``repr`` so that
+    ``nan`` matches itself and ``-0.0`` differs from ``0.0``. Dict keys are
+    sorted so key order does not matter. Raises ``TypeError`` for values
+    that cannot be keyed.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((k, _condition_key(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        kind = tuple if isinstance(value, tuple) else list
+        return (kind, tuple(_condition_key(item) for item in value))
+    if isinstance(value, float):
+        return (float, repr(value))
+    hash(value)
+    return (type(value), value)
+
+
+def _condition_from_key(key: Any) -> Any:
+    """
+    Rebuild the value that ``_condition_key`` produced ``key`` from.
+    """
+    kind, data = key
+    if kind is dict:
+        return {k: _condition_from_key(v) for k, v in data}
+    if kind is list:
+        return [_condition_from_key(item) for item in data]
+    if kind is tuple:
+        return tuple(_condition_from_key(item) for item in data)
+    if kind is float:
+        return float(data)
+    return data
+
+
+def _compile_conditions(conditions: List[Dict]) -> Tuple[_Condition, ...]:
+    """
+    Turn condition dictionaries into ``(search, predicate)`` pairs.
+
+    Malformed conditions, unknown operators, and operators missing their
+    ``value`` are dropped, so they never block a rule. A condition that
+    cannot be compiled at all always fails.
+    """
+    compiled = []
+    for condition in conditions:
+        try:
+            if not all(k in condition for k in ["field", "operator"]):
+                continue  # Skip malformed conditions
+
+            try:
+                search = _compile_path(condition["field"]).search
+            except JMESPathError:
+                # An unparseable path never resolves to a value
+                search = _missing_field
+
+            predicate = _condition_predicate(condition["operator"], condition)
+        except Exception:
+            search, predicate = _missing_field, _never
+
+        if predicate is not _always:
+            compiled.append((search, predicate))
+    return tuple(compiled)
+
+
+def _missing_field(body: Any) -> None:
+    return None
+
+
+def _always(field_value: Any) -> bool:
+    return True
+
+
+def _never(field_value: Any) -> bool:
+    return False
+
+
+def _is_none(field_value: Any) -> bool:
+    return field_value is None
+
+
+def _is_not_none(field_value: Any) -> bool:
+    return field_value is not None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _numeric(rejects: Callable[[Any, Any], bool]) -> _PredicateBuilder:
+    # Phrased as "not rejected" to match the original <=/>= checks exactly
+    def build(expected: Any) -> Callable[[Any], bool]:
+        return lambda v: _is_number(v) and not rejects(v, expected)
+
+    return build
+
+
+def _membership(negate: bool) -> _PredicateBuilder:
+    def build(expected: Any) -> Callable[[Any], bool]:
+        if not isinstance(expected, (list, tuple)):
+            return _never
+        contains = _member_lookup(expected)
+        if negate:
+            return lambda v: not contains(v)
+        return contains
+
+    return build
+
+
+def _member_lookup(expected: Union[List, Tuple]) -> Callable[[Any], bool]:
+    # Hash the allowed values once so each check is a set probe rather than
+    # a scan; lists holding objects or arrays keep the linear ``in``
+    try:
+        members = frozenset(expected)
+    except TypeError:
+        return expected.__contains__
+
+    def contains(value: Any) -> bool:
+        try:
+            return value in members
+        except TypeError:
+            return value in expected
+
+    return contains
+
+
+def _text(check: Callable[[str, str], bool]) -> _PredicateBuilder:
+    def build(expected: Any) -> Callable[[Any], bool]:
+        text = str(expected)
+        return lambda v: isinstance(v, str) and check(v, text)
+
+    return build
+
+
+def _like(negate: bool) -> _PredicateBuilder:
+    def build(expected: Any) -> Callable[[Any], bool]:
+        like = _like_regex(str(expected)).match
+        if negate:
+            return lambda v: isinstance(v, str) and like(v) is None
+        return lambda v: isinstance(v, str) and like(v) is not None
+
+    return build
+
+
+def _contains(negate: bool) -> _PredicateBuilder:
+    def build(expected: Any) -> Callable[[Any], bool]:
+        if negate:
+            return lambda v: not _contains_value(v, expected)
+        return lambda v: _contains_value(v, expected)
+
+    return build
+
+
+def _between(negate: bool) -> _PredicateBuilder:
+    def build(expected: Any) -> Callable[[Any], bool]:
+        if not isinstance(expected, (list, tuple)) or len(expected) != 2:
+            return _never
+        low, high = expected
+        if negate:
+            return lambda v: _is_number(v) and not low <= v <= high
+        return lambda v: _is_number(v) and low <= v <= high
+
+    return build
+
+
+def _equals(negate: bool) -> _PredicateBuilder:
+    def build(expected: Any) -> Callable[[Any], bool]:
+        if negate:
+            return lambda v: v != expected
+        return lambda v: v == expected
+
+    return build
+
+
+#: Operators that only look at the field. A field counts as existing exactly
+#: when it resolves to a non-null value.
+_FIELD_OPERATORS: Dict[str, Callable[[Any], bool]] = {
+    "exists": _is_not_none,
+    "nexists": _is_none,
+    "isnull": _is_none,
+    "notnull": _is_not_none,
+}
+
+#: Operators that compare the field with the condition's ``value``, mapped to
+#: a builder that binds that value into a predicate.
+_VALUE_OPERATORS: Dict[str, _PredicateBuilder] = {
+    "eq": _equals(negate=False),
+    "ne": _equals(negate=True),
+    "gt": _numeric(operator.le),
+    "lt": _numeric(operator.ge),
+    "ge": _numeric(operator.lt),
+    "le": _numeric(operator.gt),
+    "in": _membership(negate=False),
+    "nin": _membership(negate=True),
+    "like": _like(negate=False),
+    "nlike": _like(negate=True),
+    "contains": _contains(negate=False),
+    "ncontains": _contains(negate=True),
+    "between": _between(negate=False),
+    "nbetween": _between(negate=True),
+    "startswith": _text(str.startswith),
+    "endswith": _text(str.endswith),
+}
+
+
+def _condition_predicate(name: Any, condition: Dict) -> Callable[[Any], bool]:
+    """
+    Build the check for one condition, given the value found at its field.
+
+    Unknown operators, and value operators without a ``value``, do not
+    restrict the rule.
+    """
+    if not isinstance(name, str):
+        return _always
+
+    field_check = _FIELD_OPERATORS.get(name)
+    if field_check is not None:
+        return field_check
+
+    build = _VALUE_OPERATORS.get(name)
+    if build is None or "value" not in condition:
+        return _always
+    return build(condition["value"])
+
+
 def _like_match(value: str, pattern: str) -> bool:
     """
     Implement SQL-like LIKE operator for string matching with wildcards.
@@ -269,9 +440,16 @@ def _like_match(value: str, pattern: str) -> bool:
     Returns:
         True if pattern matches, False otherwise
     """
-    # Convert SQL LIKE pattern to regex
+    return _like_regex(pattern).match(value) is not None
+
+
+@functools.lru_cache(maxsize=1024)
+def _like_regex(pattern: str) -> "re.Pattern[str]":
+    """
+    Translate a SQL LIKE pattern to a compiled regex, once per pattern.
+    """
     regex_pattern = "^" + re.escape(pattern).replace("%", ".*").replace("_", ".") + "$"
-    return bool(re.match(regex_pattern, value, re.DOTALL))
+    return re.compile(regex_pattern, re.DOTALL)
 
 
 def _contains_value(field_value: Any, target_value: Any) -> bool:
@@ -305,6 +483,7 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
     """
     Set a field in the JSON body at the specified path.
     Creates the field if it doesn't exist, or replaces it if it does.
+    The body is modified in place.
 
     Args:
         body: The JSON request body
@@ -314,8 +493,7 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
     Returns:
         The modified JSON body
     """
-    # Make a copy to avoid side effects
-    result = orjson.loads(orjson.dumps(body))
+    result = body
 
     # Special case for root replacement
     if path == "" or path == "$":
@@ -325,15 +503,43 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
     processed_value = _process_value_references(value, body)
 
     # Split path into segments for navigation
-    segments = path.replace("[", ".").replace("]", "").split(".")
-    segments = [s for s in segments if s]  # Remove empty segments
+    segments = _split_path(path)
 
     # Handle empty path
     if not segments:
         return result
 
+    # Containers created on the way down are recorded so that a rule that
+    # fails partway (e.g. on an index segment int() rejects) can remove them
+    # and leave the body exactly as it found it
+    created: List[Tuple[Union[Dict, List], Any]] = []
+    try:
+        if _assign_path(result, segments, processed_value, created):
+            return result
+    except Exception:
+        _discard_created(created)
+        raise
+    _discard_created(created)
+    return result
+
+
+def _assign_path(
+    current: Any,
+    segments: Tuple[str, ...],
+    value: Any,
+    created: List[Tuple[Union[Dict, List], Any]],
+) -> bool:
+    """
+    Walk ``segments`` from ``current``, creating missing containers, and
+    assign ``value`` at the end.
+
+    Each created container is appended to ``created`` as ``(dict, key)``
+    or ``(list, original length)``.
+
+    Returns:
+        True if the value was assigned, False if the path cannot be reached
+    """
     # Navigate/create path
-    current = result
     for i, segment in enumerate(segments[:-1]):
         next_segment = segments[i + 1] if i + 1 < len(segments) - 1 else segments[-1]
 
@@ -343,6 +549,7 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
         if isinstance(current, dict):
             # Create node if it doesn't exist
             if segment not in current:
+                created.append((current, segment))
                 if is_next_array:
                     current[segment] = []
                 else:
@@ -352,6 +559,8 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
             if segment.isdigit():
                 idx = int(segment)
                 # Extend list if needed
+                if len(current) <= idx:
+                    created.append((current, len(current)))
                 while len(current) <= idx:
                     if is_next_array:
                         current.append([])
@@ -360,16 +569,16 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
                 current = current[idx]
             else:
                 # Can't navigate non-numeric segment in a list
-                return result
+                return False
         else:
             # Can't navigate further
-            return result
+            return False
 
     # Process the last segment
     last_segment = segments[-1]
 
     if isinstance(current, dict):
-        current[last_segment] = processed_value
+        current[last_segment] = value
     elif isinstance(current, list):
         if last_segment.isdigit():
             idx = int(last_segment)
@@ -378,19 +587,51 @@ def _set_field(body: Union[Dict, List], path: str, value: Any) -> Union[Dict, Li
                 current.append(None)
             # Insert at specific position
             if idx < len(current):
-                current[idx] = processed_value  # Replace
+                current[idx] = value  # Replace
             else:
-                current.append(processed_value)  # Append
+                current.append(value)  # Append
         else:
             # Can't add non-numeric segment to list
-            return result
+            return False
+
+    return True
 
-    return result
+
+def _discard_created(created: List[Tuple[Union[Dict, List], Any]]) -> None:
+    """
+    Remove containers recorded by ``_assign_path``, newest first.
+    """
+    for container, marker in reversed(created):
+        if isinstance(container, dict):
+            container.pop(marker, None)
+        else:
+            del container[marker:]
+
+
+@functools.lru_cache(maxsize=512)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """
+    Split a rule path like ``items[0].name`` into its non-empty segments.
+
+    Segments are interned, so dict lookups against keys that are themselves
+    interned compare by identity.
+    """
+    segments = path.replace("[", ".").replace("]", "").split(".")
+    return tuple(sys.intern(s) for s in segments if s)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_path(path: str) -> ParsedResult:
+    """
+    Compile a JMESPath expression once; parse errors are raised, not cached.
+    """
+    return jmespath.compile(path)
 
 
 def _remove_field(body: Union[Dict, List], path: str) -> Union[Dict, List]:
     """
     Remove a field from the JSON body at the specified path.
+    The body is modified in place.
 
     Args:
         body: The JSON request body
@@ -399,8 +640,7 @@ def _remove_field(body: Union[Dict, List], path: str) -> Union[Dict, List]:
     Returns:
         The modified JSON body
     """
-    # Make a copy to avoid side effects
-    result = orjson.loads(orjson.dumps(body))
+    result = body
 
     # Special case for root removal
     if path == "" or path == "$":
@@ -408,13 +648,12 @@ def _remove_field(body: Union[Dict, List], path: str) -> Union[Dict, List]:
 
     try:
         # Check if path exists
-        if jmespath.search(path, result) is None:
+        if _compile_path(path).search(result) is None:
             # Nothing to remove
             return result
 
         # Split path into segments for navigation
-        segments = path.replace("[", ".").replace("]", "").split(".")
-        segments = [s for s in segments if s]  # Remove empty segments
+        segments = _split_path(path)
 
         # Navigate to the parent of the target
         current = result
@@ -489,26 +728,32 @@ def _process_value_references(value: Any, original_body: Union[Dict, List]) -> A
     if isinstance(value, list):
         return [_process_value_references(item, original_body) for item in value]
 
-    # Non-string scalars are returned unchanged
-    if not isinstance(value, str):
+    # Non-string scalars, and the common string with no reference at all,
+    # are returned unchanged without touching the regex
+    if not isinstance(value, str) or "${{" not in value:
         return value
 
     # The entire string is a single reference -> return the resolved value as-is
     if value.startswith("${{") and value.endswith("}}"):
         try:
             path = value[3:-2].strip()
-            return jmespath.search(path, original_body)
+            resolved = _compile_path(path).search(original_body)
         except JMESPathError:
             return None  # Return null if reference processing fails
+        # Rules edit the body in place, so a referenced object or array is
+        # copied rather than shared with the body it came from
+        if isinstance(resolved, (dict, list)):
+            return orjson.loads(orjson.dumps(resolved))
+        return resolved
 
     # Embedded references within a larger string -> interpolate
-    if "${{" in value and "}}" in value:
+    if "}}" in value:
         try:
 
             def replace_match(match: "re.Match") -> str:
                 path = match.group(1).strip()
                 try:
-                    result = jmespath.search(path, original_body)
+                    result = _compile_path(path).search(original_body)
                     if result is None:
                         return ""  # Missing values replaced with empty string
                     if isinstance(result, (dict, list)):
@@ -518,7 +763,7 @@ def _process_value_references(value: Any, original_body: Union[Dict, List]) -> A
                 except JMESPathError:
                     return ""  # Return empty string if path is invalid
 
-            return re.sub(r"\$\{\{([^}]*)\}\}", replace_match, value)
+            return _REFERENCE_PATTERN.sub(replace_match, value)
         except Exception:
             return value  # Return unchanged if string interpolation fails
 
@@ -0,0 +1,8 @@
+import pytest
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    # Run the in-process unit tests before anything that boots real servers,
+    # so `pytest -x` reports a regression in seconds rather than after the
+    # e2e suite. The sort is stable, so file order holds within each group.
+    items.sort(key=lambda item: ("e2e" in item.keywords) + ("slow" in item.keywords))
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import os
 import random
 import socket
@@ -13,6 +12,7 @@ from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 import pytest
 import uvicorn
 from fastapi import FastAPI, Request
@@ -33,14 +33,17 @@ def get_free_port() -> int:
 def wait_for_http(url: str, headers: dict[str, str] | None = None) -> None:
     deadline = time.time() + 10
     last_error = None
-    while time.time() < deadline:
-        try:
-            response = httpx.get(url, headers=headers, timeout=1)
-            if response.status_code < 500:
-                return
-        except Exception as exc:
-            last_error = exc
-        time.sleep(0.05)
+    # One client for the whole poll: a module-level httpx.get builds and
+    # tears down a client (and its connection pool) on every attempt.
+    with httpx.Client(headers=headers, timeout=1) as client:
+        while time.time() < deadline:
+            try:
+                response = client.get(url)
+                if response.status_code < 500:
+                    return
+            except Exception as exc:
+                last_error = exc
+            time.sleep(0.05)
     raise RuntimeError(f"Timed out waiting for {url}: {last_error}")
 
 
@@ -75,9 +78,16 @@ class UpstreamState:
             self.records.append(record)
 
 
-@pytest.fixture
-def upstream_server():
-    state = UpstreamState()
+@pytest.fixture(scope="session")
+def upstream_app():
+    """
+    One fake upstream for the whole session.
+
+    Starting a uvicorn server per test dominated e2e setup time. Tests get
+    isolated state through ``upstream_server``, which swaps in a fresh
+    ``UpstreamState`` that each request resolves when it arrives.
+    """
+    current = {"state": UpstreamState()}
     app = FastAPI()
     port = get_free_port()
 
@@ -86,6 +96,7 @@ def upstream_server():
         methods=["GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     )
     async def catch_all(request: Request, path: str):
+        state = current["state"]
         if path == "health":
             return {"status": "ok"}
 
@@ -94,8 +105,8 @@ def upstream_server():
         raw_body = await request.body()
         body: Any
         try:
-            body = json.loads(raw_body) if raw_body else None
-        except json.JSONDecodeError:
+            body = orjson.loads(raw_body) if raw_body else None
+        except orjson.JSONDecodeError:
             body = raw_body.decode("utf-8", errors="replace")
 
         record = {
@@ -182,12 +193,19 @@ def upstream_server():
     thread.start()
     wait_for_http(f"http://127.0.0.1:{port}/health")
 
-    yield f"http://127.0.0.1:{port}", state
+    yield f"http://127.0.0.1:{port}", current
 
     server.should_exit = True
     thread.join(timeout=5)
 
 
+@pytest.fixture
+def upstream_server(upstream_app):
+    url, current = upstream_app
+    state = current["state"] = UpstreamState()
+    yield url, state
+
+
 @pytest.fixture
 def proxy_server(tmp_path: Path, upstream_server):
     upstream_url, _ = upstream_server
@@ -164,6 +164,7 @@ def test_fully_consumed_stream_releases_the_key(proxy_server):
     assert after.status_code == 200
 
 
+@pytest.mark.slow
 def test_demand_above_the_key_rate_ceiling_expires_instead_of_draining(
     proxy_server,
 ):
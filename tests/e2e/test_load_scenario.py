@@ -32,7 +32,8 @@ import pytest
 
 from tests.e2e.conftest import PROXY_KEY
 
-pytestmark = pytest.mark.e2e
+# A 200-request burst against real servers; the longest test in the suite.
+pytestmark = [pytest.mark.e2e, pytest.mark.slow]
 
 KEYS = ("key-1", "key-2", "key-3", "key-4", "key-5")
 BURST = 200
@@ -1,5 +1,8 @@
 """Shared fakes and helpers for the nya/core unit test modules."""
 
+import asyncio
+import time
+
 from httpx import Headers
 from starlette.datastructures import URL
 
@@ -171,6 +174,16 @@ def make_request(
     )
 
 
+async def wait_until(predicate, timeout=1.0):
+    """Yield to the event loop until ``predicate()`` holds or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(0)
+    return True
+
+
 class FakeStreamContext:
     def __init__(self, response):
         self.response = response
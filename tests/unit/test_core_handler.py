@@ -148,7 +148,9 @@ async def test_custom_upstream_header_does_not_forward_gateway_authorization():
 
 
 @pytest.mark.asyncio
-async def test_handler_process_headers_reports_missing_and_bad_variable_config():
+async def test_handler_process_headers_reports_missing_and_bad_variable_config(
+    monkeypatch,
+):
     config = CoreConfig()
     handler = RequestHandler(config)
     request = make_request()
@@ -163,13 +165,27 @@ async def test_handler_process_headers_reports_missing_and_bad_variable_config()
     with pytest.raises(VariablesConfigurationError, match="has no configured values"):
         await handler.process_request_headers(request)
 
+    def bad_template(*args, **kwargs):
+        raise RuntimeError("bad template")
+
     config.headers = {"Authorization": "Bearer ${{api_key}}"}
-    original_process_headers = HeaderUtils.process_headers
-    HeaderUtils.process_headers = staticmethod(
-        lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("bad template"))
-    )
+    monkeypatch.setattr(HeaderUtils, "process_headers", staticmethod(bad_template))
     with pytest.raises(VariablesConfigurationError):
-        try:
-            await handler.process_request_headers(request)
-        finally:
-            HeaderUtils.process_headers = original_process_headers
+        await handler.process_request_headers(request)
+
+
+def test_handler_route_table_prefers_api_names_over_aliases():
+    config = CoreConfig()
+    config.apis["other"] = {
+        "endpoint": "https://other.test",
+        "aliases": ["/mock/", "alias", 7],
+    }
+    handler = RequestHandler(config)
+
+    assert handler.parse_request(make_request("/api/mock/v1")) == ("mock", "/v1")
+    assert handler.parse_request(make_request("/api/alias")) == ("mock", "/")
+    assert handler.parse_request(make_request("/api/alias/")) == ("mock", "/")
+    assert handler.parse_request(make_request("/api/other/a/b")) == (
+        "other",
+        "/a/b",
+    )
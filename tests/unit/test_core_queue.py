@@ -13,7 +13,7 @@ from nya.common.exceptions import (
 )
 from nya.core.control import TrafficManager
 from nya.core.queue import RequestQueue
-from tests.unit.core_helpers import CoreConfig, make_request
+from tests.unit.core_helpers import CoreConfig, make_request, wait_until
 
 
 @pytest.mark.asyncio
@@ -26,10 +26,8 @@ async def test_queue_rejects_full_or_over_quota_requests():
 
     with pytest.raises(QueueFullError):
         await queue.enqueue_request(request)
-
-    for task in queue._worker_tasks.get("mock", []):
-        task.cancel()
-    await asyncio.gather(*queue._worker_tasks.get("mock", []), return_exceptions=True)
+    # A queue that can never hold anything does not start workers
+    assert "mock" not in queue._worker_tasks
 
     config.queue_size = 10
     config.queue_expiry = 0.01
@@ -57,7 +55,7 @@ async def test_queue_enqueue_success_waits_records_metrics_and_reuses_workers(
         record_rate_limit_hit=lambda api: metrics.hits.append(api),
         record_queue_hit=lambda api: metrics.queues.append(api),
     )
-    queue = RequestQueue(config, control, metrics)
+    queue = RequestQueue(config, control, metrics, clock=lambda: 1_000.0)
     request = make_request()
     request.api_name = "mock"
     sleeps = []
@@ -76,6 +74,8 @@ async def test_queue_enqueue_success_waits_records_metrics_and_reuses_workers(
 
     assert future is request.future
     assert request.priority == 1
+    # The age is measured on the queue's own clock, not the request's
+    assert request.added_at == 1_000.0
     assert sleeps == []
     assert metrics.hits == []
     assert metrics.queues == ["mock"]
@@ -92,7 +92,7 @@ async def test_queue_processor_loop_handles_no_processor_expiry_success_and_erro
 ):
     config = CoreConfig()
     control = TrafficManager(config)
-    queue = RequestQueue(config, control)
+    queue = RequestQueue(config, control, clock=lambda: 1_000.0)
 
     await queue._process_api_queue("mock")
 
@@ -101,7 +101,7 @@ async def test_queue_processor_loop_handles_no_processor_expiry_success_and_erro
     expired = make_request()
     expired.api_name = "mock"
     expired.future = asyncio.Future()
-    expired.added_at = time.time() - 10
+    expired.added_at = 990.0
     await queue._queues["mock"].put(expired)
     queue.register_processor(
         lambda request: asyncio.sleep(0, result=Response(status_code=200))
@@ -115,6 +115,7 @@ async def test_queue_processor_loop_handles_no_processor_expiry_success_and_erro
     successful = make_request()
     successful.api_name = "mock"
     successful.future = asyncio.Future()
+    successful.added_at = 1_000.0
     queue._check_for_resource_limit = lambda api_name, **kwargs: asyncio.sleep(
         0, result=("key-a", 0)
     )
@@ -127,6 +128,7 @@ async def test_queue_processor_loop_handles_no_processor_expiry_success_and_erro
     errored = make_request()
     errored.api_name = "mock"
     errored.future = asyncio.Future()
+    errored.added_at = 1_000.0
 
     async def bad_worker(api_name, request):
         raise RuntimeError("worker failed")
@@ -147,7 +149,7 @@ async def test_queue_processes_success_failure_retry_and_expiry(monkeypatch):
     config.retry_enabled = True
     config.retry_after = 0
     control = TrafficManager(config)
-    queue = RequestQueue(config, control)
+    queue = RequestQueue(config, control, clock=lambda: 1_000.0)
     queue._queues["mock"] = asyncio.PriorityQueue()
 
     success = make_request()
@@ -191,8 +193,10 @@ async def test_queue_processes_success_failure_retry_and_expiry(monkeypatch):
 
     expired = make_request()
     expired.api_name = "mock"
-    expired.added_at = time.time() - 10
+    expired.added_at = 990.0
     assert queue._is_request_expired(expired) is True
+    # A caller's snapshot of the clock takes precedence over a fresh read
+    assert queue._is_request_expired(expired, now=991.0) is False
 
     done = make_request()
     done.api_name = "mock"
@@ -270,12 +274,12 @@ async def test_key_blocking_ignores_unconfigured_status_and_disabled_policy():
 async def test_queue_wait_for_key_expires_and_basic_status_methods():
     config = CoreConfig()
     control = TrafficManager(config)
-    queue = RequestQueue(config, control)
+    queue = RequestQueue(config, control, clock=lambda: 1_000.0)
     queue._queues["mock"] = asyncio.PriorityQueue()
     request = make_request()
     request.api_name = "mock"
     request.future = asyncio.Future()
-    request.added_at = time.time() - 10
+    request.added_at = 990.0
     # Every key held: the request has nothing to acquire and is already past
     # the queue expiry, so the wait must end in RequestExpiredError.
     for held in config.keys:
@@ -367,10 +371,7 @@ async def test_waiting_requests_are_counted_after_a_worker_claims_them():
     await queue.enqueue_request(request)
 
     # Give the worker a moment to claim it and enter the wait loop.
-    for _ in range(50):
-        await asyncio.sleep(0.01)
-        if queue.get_all_waiting_counts().get("mock"):
-            break
+    assert await wait_until(lambda: queue.get_all_waiting_counts().get("mock"))
 
     assert queue.get_all_queue_sizes().get("mock", 0) == 0  # the user's report
     assert queue.get_all_waiting_counts() == {"mock": 1}  # the missing number
@@ -379,10 +380,7 @@ async def test_waiting_requests_are_counted_after_a_worker_claims_them():
     control.unlock_key("mock", config.keys[0])
     await asyncio.wait_for(request.future, timeout=5)
 
-    for _ in range(50):
-        await asyncio.sleep(0.01)
-        if not queue.get_all_waiting_counts():
-            break
+    assert await wait_until(lambda: not queue.get_all_waiting_counts())
     assert queue.get_all_waiting_counts() == {}
 
     await queue.close()
@@ -408,7 +406,8 @@ async def test_release_wakes_a_waiter_long_before_its_timed_deadline():
     request._rate_limited = False
     await queue.enqueue_request(request)
 
-    await asyncio.sleep(0.1)  # let the worker claim and park
+    # Let the worker claim the request and park on the condition.
+    assert await wait_until(lambda: queue.get_all_waiting_counts().get("mock"))
     started = time.time()
     control.unlock_key("mock", config.keys[0])
 
@@ -481,18 +480,12 @@ async def test_cancelled_client_frees_its_worker_immediately():
     request._rate_limited = False
     await queue.enqueue_request(request)
 
-    for _ in range(50):
-        await asyncio.sleep(0.01)
-        if queue.get_all_waiting_counts().get("mock"):
-            break
+    assert await wait_until(lambda: queue.get_all_waiting_counts().get("mock"))
     assert queue.get_all_waiting_counts() == {"mock": 1}
 
     request.future.cancel()
 
     # Worker freed well inside a second — not at a 30s/60s deadline.
-    for _ in range(100):
-        await asyncio.sleep(0.01)
-        if not queue.get_all_waiting_counts():
-            break
+    assert await wait_until(lambda: not queue.get_all_waiting_counts())
     assert queue.get_all_waiting_counts() == {}
     await queue.close()
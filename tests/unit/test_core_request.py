@@ -1,5 +1,7 @@
+import logging
 from types import SimpleNamespace
 
+import httpx
 import pytest
 
 from nya.core.request import RequestExecutor
@@ -91,6 +93,72 @@ async def test_request_executor_execute_request_and_cleanup_on_processing_error(
     assert stream_ctx.closed is True
 
 
+@pytest.mark.asyncio
+async def test_request_executor_round_trips_through_a_mock_transport():
+    seen = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        # An explicit stream keeps the body unread, like a real transport;
+        # ``content=`` would pre-read it and the executor reads raw bytes.
+        return httpx.Response(
+            201,
+            headers={"content-type": "application/json", "x-upstream": "yes"},
+            stream=httpx.ByteStream(b'{"ok":true}'),
+        )
+
+    executor = RequestExecutor(CoreConfig(), transport=httpx.MockTransport(upstream))
+    request = make_request(
+        method="POST",
+        headers={
+            "content-type": "application/json",
+            "connection": "x-private",
+            "x-private": "drop-me",
+            "x-client": "keep-me",
+        },
+        content=b'{"q":1}',
+    )
+    request.api_name = "mock"
+    request.url = "https://upstream.test/v1/chat?stream=false"
+
+    response = await executor.execute(request)
+
+    assert response.status_code == 201
+    assert response.body == b'{"ok":true}'
+    assert response.headers["x-upstream"] == "yes"
+    assert str(seen[0].url) == "https://upstream.test/v1/chat?stream=false"
+    assert seen[0].content == b'{"q":1}'
+    assert seen[0].headers["x-client"] == "keep-me"
+    assert "x-private" not in seen[0].headers
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_request_executor_skips_debug_serialization_above_debug(
+    monkeypatch, caplog
+):
+    executor = RequestExecutor(CoreConfig())
+    request = make_request()
+    request.url = "https://upstream.test/v1"
+    serialized = []
+    monkeypatch.setattr(
+        "nya.core.request.json_safe_dumps", lambda obj: serialized.append(obj) or ""
+    )
+    monkeypatch.setattr(
+        "nya.core.request.format_elapsed_time",
+        lambda seconds: serialized.append(seconds) or "",
+    )
+    caplog.set_level(logging.INFO, logger="nya.core.request")
+
+    async def fake_execute_request(request, timeout):
+        return FakeHttpxResponse([b"nope"], status_code=500)
+
+    executor.execute_request = fake_execute_request
+    await executor.execute(request)
+    assert serialized == []
+    await executor.close()
+
+
 @pytest.mark.asyncio
 async def test_request_executor_close_is_noop_without_client():
     executor = object.__new__(RequestExecutor)
@@ -146,3 +214,25 @@ def test_request_executor_timeout_and_proxy_client_options(monkeypatch):
 
     assert captured["proxy"] == "http://proxy.test"
     assert executor._get_timeout("mock").read == pytest.approx(4.75)
+
+
+@pytest.mark.asyncio
+async def test_request_executor_warns_when_transport_bypasses_proxy(caplog):
+    config = CoreConfig()
+    config.proxy_enabled = True
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+    with caplog.at_level(logging.WARNING, logger="nya.core.request"):
+        executor = RequestExecutor(config, transport=transport)
+
+    assert "overrides the configured proxy" in caplog.text
+    # The proxy address may carry credentials, so it is never logged
+    assert "proxy.test" not in caplog.text
+    await executor.close()
+
+    caplog.clear()
+    config.proxy_enabled = False
+    with caplog.at_level(logging.WARNING, logger="nya.core.request"):
+        executor = RequestExecutor(config, transport=transport)
+    assert caplog.text == ""
+    await executor.close()
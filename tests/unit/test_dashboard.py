@@ -13,6 +13,7 @@ import pytest
 from starlette.testclient import TestClient
 
 from nya.dashboard.api import DashboardAPI
+from nya.services.metrics import MetricsCollector
 
 # --------------------------------------------------------------------------
 # Fakes
@@ -87,12 +88,15 @@ def make_dashboard(*, with_deps=True, enable_control=True):
     return dashboard
 
 
-@pytest.fixture
+# The fakes are read-only as far as the routes under test are concerned, so
+# one dashboard app per module is enough; building the FastAPI app and its
+# routes for every test only costs time.
+@pytest.fixture(scope="module")
 def client():
     return TestClient(make_dashboard().app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def bare_client():
     """Dashboard with no metrics collector / queue wired in."""
     return TestClient(make_dashboard(with_deps=False).app)
@@ -132,6 +136,20 @@ def test_metrics_returns_payload_with_collector(client):
     assert "apis" in resp.json()
 
 
+def test_metrics_serializes_status_code_breakdowns():
+    collector = MetricsCollector()
+    collector.record_request("openai", "key-1")
+    collector.record_response("openai", "key-1", 200, 0.1)
+    dashboard = DashboardAPI()
+    dashboard.set_metrics_collector(collector)
+    client = TestClient(dashboard.app)
+
+    resp = client.get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.json()["apis"]["openai"]["responses"] == {"200": 1}
+    assert client.get("/api/metrics/openai").json()["status_codes"] == {"200": 1}
+
+
 def test_api_metrics_found(client):
     resp = client.get("/api/metrics/openai")
     assert resp.status_code == 200
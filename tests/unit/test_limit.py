@@ -1,40 +1,51 @@
 """
 Unit tests for ``nya.services.limit.RateLimiter``.
 
-Time-sensitive behaviour is exercised by manipulating the internal
-timestamp deque directly rather than sleeping, so the suite stays fast
-and deterministic.
+Time-sensitive behaviour is exercised through an injected clock rather
+than sleeping, so the suite stays fast and deterministic.
 """
 
-import time
-
 import pytest
 
 from nya.common.exceptions import ConfigurationError
 from nya.services.limit import DEFAULT_LOCK_TTL_SECONDS, RateLimiter
 
-# --------------------------------------------------------------------------
-# Rate-limit string parsing
-# --------------------------------------------------------------------------
 
+class FakeClock:
+    """Manually advanced stand-in for ``time.time`` or ``time.monotonic``."""
 
-def test_parse_simple_format():
-    limiter = RateLimiter("100/m")
-    assert limiter.requests_limit == 100
-    assert limiter.window_seconds == 60
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
 
+    def __call__(self) -> float:
+        return self.now
 
-def test_parse_compound_format():
-    limiter = RateLimiter("1/10s")
-    assert limiter.requests_limit == 1
-    assert limiter.window_seconds == 10
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
 
 
-def test_parse_each_time_unit():
-    assert RateLimiter("5/s").window_seconds == 1
-    assert RateLimiter("5/m").window_seconds == 60
-    assert RateLimiter("5/h").window_seconds == 3600
-    assert RateLimiter("5/d").window_seconds == 86400
+# --------------------------------------------------------------------------
+# Rate-limit string parsing
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("spec", "requests_limit", "window_seconds"),
+    [
+        ("100/m", 100, 60),
+        ("5/s", 5, 1),
+        ("5/h", 5, 3600),
+        ("5/d", 5, 86400),
+        ("1/10s", 1, 10),
+        ("30/5m", 30, 300),
+    ],
+)
+def test_parse_rate_limit_formats(spec, requests_limit, window_seconds):
+    limiter = RateLimiter(spec)
+    assert (limiter.requests_limit, limiter.window_seconds) == (
+        requests_limit,
+        window_seconds,
+    )
 
 
 def test_parse_zero_means_unlimited():
@@ -73,10 +84,14 @@ def test_zero_window_is_treated_as_unlimited():
 
 def test_unlimited_limiter_never_limits():
     limiter = RateLimiter("0/s")
-    for _ in range(1000):
+    # A zero quota short-circuits before any window math, so a handful of
+    # iterations past any real quota proves the point.
+    for _ in range(50):
         assert limiter.is_limited() is False
         limiter.record()
     assert limiter.is_limited() is False
+    # Nothing ever trims an unlimited window, so nothing may be kept in it.
+    assert len(limiter.request_timestamps) == 0
 
 
 def test_limiter_blocks_after_quota_exhausted():
@@ -89,10 +104,14 @@ def test_limiter_blocks_after_quota_exhausted():
 
 
 def test_old_timestamps_expire_and_free_quota():
-    limiter = RateLimiter("2/m")
-    # Two requests that "happened" 61s ago — outside the 60s window.
-    stale = time.time() - 61
-    limiter.request_timestamps.extend([stale, stale])
+    clock = FakeClock()
+    limiter = RateLimiter("2/m", clock=clock)
+    limiter.record()
+    limiter.record()
+    assert limiter.is_limited() is True
+
+    # Both requests fall outside the 60s window.
+    clock.advance(61)
     assert limiter.is_limited() is False
     limiter.record()
     assert limiter.is_limited() is False
@@ -153,11 +172,14 @@ def test_clear_resets_all_recorded_requests():
 
 
 def test_block_for_makes_limiter_limited_until_duration_passes():
-    limiter = RateLimiter("5/m")
+    clock = FakeClock()
+    limiter = RateLimiter("5/m", clock=clock)
     limiter.block_for(30)
     assert limiter.is_limited() is True
-    reset = limiter.time_until_reset()
-    assert 0 < reset <= 30
+    assert limiter.time_until_reset() == 30
+
+    clock.advance(30)
+    assert limiter.is_limited() is False
 
 
 def test_time_until_reset_zero_when_not_limited():
@@ -175,11 +197,12 @@ def test_lock_expires_so_a_missed_release_cannot_strand_a_key():
     that was missed — a bug, but one that must not cost the credential for
     the lifetime of the process.
     """
-    limiter = RateLimiter("0")
+    clock = FakeClock()
+    limiter = RateLimiter("0", monotonic=clock)
     limiter.lock(ttl=0.05)
     assert limiter.locked
 
-    time.sleep(0.06)
+    clock.advance(0.06)
 
     assert limiter.locked is False
     assert limiter.is_limited() is False
@@ -203,8 +226,23 @@ def test_explicit_unlock_still_releases_immediately():
 
 def test_lock_without_a_ttl_still_expires():
     """No caller should be able to create a lock that lives forever."""
-    limiter = RateLimiter("0")
+    clock = FakeClock()
+    limiter = RateLimiter("0", monotonic=clock)
     limiter.lock()
 
-    assert limiter._locked_until is not None
-    assert limiter._locked_until <= time.time() + DEFAULT_LOCK_TTL_SECONDS + 1
+    assert limiter.time_until_unlocked() == DEFAULT_LOCK_TTL_SECONDS
+    clock.advance(DEFAULT_LOCK_TTL_SECONDS)
+    assert limiter.locked is False
+
+
+def test_lock_deadline_ignores_wall_clock_steps():
+    wall = FakeClock()
+    monotonic = FakeClock(0.0)
+    limiter = RateLimiter("0", clock=wall, monotonic=monotonic)
+    limiter.lock(ttl=30)
+
+    wall.advance(3600)
+    assert limiter.locked
+
+    monotonic.advance(30)
+    assert limiter.locked is False
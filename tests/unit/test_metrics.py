@@ -5,6 +5,8 @@ Each ``MetricsCollector`` owns a private ``CollectorRegistry``, so tests are
 fully isolated without touching the global Prometheus registry.
 """
 
+import time
+
 from nya.services.metrics import PROMETHEUS_CONTENT_TYPE, MetricsCollector
 
 
@@ -49,6 +51,22 @@ def test_success_and_error_counts_and_rate():
     assert api["success_rate"] == 75.0
 
 
+def test_status_codes_are_grouped_by_class():
+    mc = make_collector()
+    for status in (200, 201, 304, 404, 429, 503, 0):
+        mc.record_response("openai", "key", status, 0.1)
+
+    assert mc.get_api_metrics("openai")["status_classes"] == {
+        "other": 1,
+        "1xx": 0,
+        "2xx": 2,
+        "3xx": 1,
+        "4xx": 2,
+        "5xx": 1,
+    }
+    assert mc.get_all_metrics()["apis"]["openai"]["status_classes"]["4xx"] == 2
+
+
 def test_avg_response_time_is_reported_in_milliseconds():
     mc = make_collector()
     mc.record_response("openai", "key", 200, 0.2)
@@ -129,6 +147,15 @@ def test_get_all_metrics_aggregates_global_totals():
     assert metrics["global"]["uptime_seconds"] >= 0
 
 
+def test_uptime_uses_monotonic_clock(monkeypatch):
+    now_ns = [5_000_000_000]
+    monkeypatch.setattr(time, "monotonic_ns", lambda: now_ns[0])
+    mc = make_collector()
+    now_ns[0] += 2_500_000_000
+
+    assert mc.get_all_metrics()["global"]["uptime_seconds"] == 2.5
+
+
 def test_get_all_metrics_reports_last_request_time():
     mc = make_collector()
     mc.record_request("openai", "key")
@@ -181,6 +208,23 @@ def test_reset_clears_all_metrics_and_history():
     assert mc.get_api_metrics("openai")["total_requests"] == 0
 
 
+def test_recording_after_reset_reaches_fresh_series():
+    mc = make_collector()
+    mc.record_request("openai", "key")
+    mc.record_response("openai", "key", 200, 0.1)
+    mc.reset()
+
+    mc.record_request("openai", "key")
+    mc.record_response("openai", "key", 200, 0.1)
+    mc.record_rate_limit_hit("openai")
+
+    api = mc.get_api_metrics("openai")
+    assert api["total_requests"] == 1
+    assert api["status_codes"] == {200: 1}
+    assert api["rate_limit_hits"] == 1
+    assert b'nyaproxy_requests_total{api="openai"} 1.0' in mc.render_prometheus()
+
+
 # --------------------------------------------------------------------------
 # Prometheus exposition
 # --------------------------------------------------------------------------
@@ -197,5 +241,22 @@ def test_render_prometheus_emits_exposition_text():
     assert 'api="openai"' in body
 
 
+def test_render_prometheus_only_exports_recorded_series():
+    mc = make_collector()
+    mc.record_queue_hit("openai")
+
+    body = mc.render_prometheus().decode()
+    assert 'nyaproxy_queue_hits_total{api="openai"} 1.0' in body
+    # Metrics never recorded for the API publish no zero-valued series
+    assert 'nyaproxy_rate_limit_hits_total{api="openai"}' not in body
+    assert 'nyaproxy_requests_total{api="openai"}' not in body
+    assert 'nyaproxy_active_requests{api="openai"}' not in body
+    assert 'nyaproxy_request_duration_seconds_count{api="openai"}' not in body
+
+    # A key seen only on the response path gets no request-count series
+    mc.record_response("openai", "sk-response-only-key", 200, 0.1)
+    assert "nyaproxy_key_requests_total{" not in mc.render_prometheus().decode()
+
+
 def test_prometheus_content_type_is_exported():
     assert "text/plain" in PROMETHEUS_CONTENT_TYPE
@@ -111,7 +111,8 @@ def test_weighted_strategy_uses_configured_key_weights():
     assert "key-b" not in picks
 
 
-def test_fastest_response_receives_recorded_times():
+@pytest.mark.asyncio
+async def test_fastest_response_receives_recorded_times():
     """The queue records response times so fastest_response has data."""
     config = CoreConfig()
     config.get_api_load_balancing_strategy = lambda api_name: "fastest_response"
@@ -119,17 +120,14 @@ def test_fastest_response_receives_recorded_times():
     queue = RequestQueue(config, control)
     queue._queues["mock"] = asyncio.PriorityQueue()
 
-    async def run():
-        request = make_request()
-        request.api_name = "mock"
-        request.api_key = "key-a"
-        request.future = asyncio.Future()
-        queue.register_processor(
-            lambda req: asyncio.sleep(0, result=Response(status_code=200))
-        )
-        await queue._process_with_worker("mock", request)
-
-    asyncio.run(run())
+    request = make_request()
+    request.api_name = "mock"
+    request.api_key = "key-a"
+    request.future = asyncio.Future()
+    queue.register_processor(
+        lambda req: asyncio.sleep(0, result=Response(status_code=200))
+    )
+    await queue._process_with_worker("mock", request)
 
     lb = control.get_load_balancer("mock")
     assert len(lb.response_times["key-a"]) == 1
@@ -191,7 +189,7 @@ async def test_retry_does_not_block_the_worker(monkeypatch):
     """_handle_retry must return immediately; the delay runs elsewhere."""
     config = CoreConfig()
     config.retry_enabled = True
-    config.retry_after = 0.2
+    config.retry_after = 0
     config.retry_attempts = 3
     control = TrafficManager(config)
     queue = RequestQueue(config, control)
@@ -203,12 +201,12 @@ async def test_retry_does_not_block_the_worker(monkeypatch):
     request.future = asyncio.Future()
     request.attempts = 1
 
-    started = time.monotonic()
-    await queue._handle_retry(request, 0.2)
-    elapsed = time.monotonic() - started
+    await queue._handle_retry(request, 0)
 
-    # Returns without sleeping for the retry delay
-    assert elapsed < 0.1
+    # Even with a zero backoff the re-enqueue happens in its own task, so
+    # nothing has been put back yet when _handle_retry returns.
+    assert queue._queues["mock"].empty()
+    assert request in queue._retry_tasks.values()
 
     # The request is re-enqueued with retry priority after the delay
     requeued = await asyncio.wait_for(queue._queues["mock"].get(), timeout=2)
@@ -116,10 +116,9 @@ async def test_acquire_key_records_selection_atomically():
     config = DummyConfig()
     control = TrafficManager(config)
 
-    results = await asyncio.gather(
-        control.acquire_key("example"),
-        control.acquire_key("example"),
-    )
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(control.acquire_key("example")) for _ in range(2)]
+    results = [task.result() for task in tasks]
 
     acquired = [key for key, wait_time in results if key and wait_time == 0]
     limited = [wait_time for key, wait_time in results if key is None]
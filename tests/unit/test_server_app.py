@@ -455,7 +455,35 @@ def test_create_app_instantiates_nya_proxy_app(monkeypatch):
     assert server_app.create_app() is fake_fastapi
 
 
-def test_main_sets_environment_and_runs_uvicorn(monkeypatch, tmp_path):
+# Variables main() exports to the server process through os.environ
+MAIN_ENV_VARS = (
+    "SCHEMA_PATH",
+    "SERVER_HOST",
+    "SERVER_PORT",
+    "CONFIG_PATH",
+    "REMOTE_CONFIG_URL",
+    "REMOTE_CONFIG_API_KEY",
+    "REMOTE_CONFIG_APP_NAME",
+    "DISABLE_HOT_RELOAD",
+)
+
+
+@pytest.fixture
+def main_environ(monkeypatch):
+    """
+    Start main() tests with its variables unset and restore them afterwards.
+
+    main() assigns os.environ directly, so without this its values outlive
+    the test and leak into the e2e proxy subprocesses.
+    """
+    for name in MAIN_ENV_VARS:
+        # setenv records the original value, or its absence, for teardown;
+        # delenv on an unset variable would record nothing to undo
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+
+
+def test_main_sets_environment_and_runs_uvicorn(monkeypatch, tmp_path, main_environ):
     schema = tmp_path / "schema.json"
     schema.write_text("{}")
     captured = {}
@@ -494,7 +522,9 @@ def test_main_sets_environment_and_runs_uvicorn(monkeypatch, tmp_path):
     assert captured["proxy_headers"] is False
 
 
-def test_main_copies_default_config_when_no_config_is_available(monkeypatch, tmp_path):
+def test_main_copies_default_config_when_no_config_is_available(
+    monkeypatch, tmp_path, main_environ
+):
     schema = tmp_path / "schema.json"
     default_config = tmp_path / "package-config.yaml"
     workdir = tmp_path / "work"
@@ -508,10 +538,6 @@ def test_main_copies_default_config_when_no_config_is_available(monkeypatch, tmp
         yield schema if name == server_app.DEFAULT_SCHEMA_NAME else default_config
 
     monkeypatch.chdir(workdir)
-    monkeypatch.delenv("CONFIG_PATH", raising=False)
-    monkeypatch.delenv("REMOTE_CONFIG_URL", raising=False)
-    monkeypatch.delenv("SERVER_HOST", raising=False)
-    monkeypatch.delenv("SERVER_PORT", raising=False)
     monkeypatch.setattr(
         server_app,
         "parse_args",
@@ -1,11 +1,17 @@
+import sys
+
 import pytest
 
 from nya.utils.substitution import (
     _check_rule_conditions,
+    _compiled_conditions,
+    _condition_key,
     _contains_value,
+    _like_match,
     _process_value_references,
     _remove_field,
     _set_field,
+    _split_path,
     apply_body_substitutions,
 )
 
@@ -30,6 +36,8 @@ def test_invalid_or_non_json_bodies_are_returned_unchanged():
     assert apply_body_substitutions("plain text", [{"name": "x"}]) == "plain text"
     assert apply_body_substitutions(42, [{"name": "x"}]) == 42
     assert apply_body_substitutions({"a": 1}, []) == {"a": 1}
+    # Without rules the body is not even decoded
+    assert apply_body_substitutions(b'{"a": 1}', []) == b'{"a": 1}'
 
 
 def test_malformed_rules_and_unknown_operations_are_ignored():
@@ -85,6 +93,53 @@ def test_set_remove_and_legacy_operations_apply_in_order_without_mutating_input(
     assert "drop" not in result
 
 
+def test_rule_that_fails_partway_leaves_no_created_nodes_behind():
+    # "²" reads as a digit but int() rejects it, after the walk has already
+    # created containers for the earlier segments
+    rules = [
+        {"name": "dict", "operation": "set", "path": "a.b.²", "value": 1},
+        {"name": "list", "operation": "set", "path": "x.3.²", "value": 1},
+        {"name": "ok", "operation": "set", "path": "y", "value": 2},
+    ]
+
+    assert apply_body_substitutions({"x": [1]}, rules) == {"x": [1], "y": 2}
+    # A dict key spelled "²" is still a plain key
+    assert _set_field({"a": {"²": 0}}, "a.²", 1) == {"a": {"²": 1}}
+
+
+def test_rules_edit_one_copy_and_referenced_values_stay_independent():
+    body = {"a": {"b": 1}}
+    assert _set_field(body, "a.c", 2) is body
+    assert _remove_field(body, "a.b") is body
+    assert body == {"a": {"c": 2}}
+
+    original = {"messages": [{"role": "user"}]}
+    result = apply_body_substitutions(
+        original,
+        [
+            {
+                "name": "keep",
+                "operation": "set",
+                "path": "kept",
+                "value": "${{messages}}",
+            },
+            {
+                "name": "nest",
+                "operation": "set",
+                "path": "messages[0].self",
+                "value": "${{messages}}",
+            },
+            {"name": "drop", "operation": "remove", "path": "messages[0].role"},
+        ],
+    )
+
+    assert original == {"messages": [{"role": "user"}]}
+    assert result == {
+        "messages": [{"self": [{"role": "user"}]}],
+        "kept": [{"role": "user"}],
+    }
+
+
 def test_root_replacement_and_removal():
     assert apply_body_substitutions(
         {"payload": {"ok": True}},
@@ -109,6 +164,8 @@ def test_root_replacement_and_removal():
         ({"value": 3}, {"field": "value", "operator": "le", "value": 3}),
         ({"value": "a"}, {"field": "value", "operator": "in", "value": ["a", "b"]}),
         ({"value": "c"}, {"field": "value", "operator": "nin", "value": ["a", "b"]}),
+        ({"value": [1]}, {"field": "value", "operator": "in", "value": [[1], 2]}),
+        ({"value": [1]}, {"field": "value", "operator": "nin", "value": [1, 2]}),
         ({"value": "hello"}, {"field": "value", "operator": "like", "value": "he%o"}),
         ({"value": "hello"}, {"field": "value", "operator": "nlike", "value": "bye%"}),
         (
@@ -144,6 +201,7 @@ def test_conditions_that_match_apply_rule(body, condition):
         ({"value": 4}, {"field": "value", "operator": "le", "value": 3}),
         ({"value": "a"}, {"field": "value", "operator": "in", "value": "a"}),
         ({"value": "a"}, {"field": "value", "operator": "nin", "value": ["a"]}),
+        ({"value": {"a": 1}}, {"field": "value", "operator": "in", "value": ["a"]}),
         ({"value": 1}, {"field": "value", "operator": "like", "value": "%"}),
         ({"value": "hello"}, {"field": "value", "operator": "nlike", "value": "%"}),
         ({"value": ["a"]}, {"field": "value", "operator": "contains", "value": "b"}),
@@ -245,10 +303,17 @@ def test_private_helpers_cover_navigation_and_error_edges(monkeypatch):
     assert _contains_value({"a": 1}, "a") is True
     assert _contains_value(3, 3) is True
 
+    assert _like_match("gpt-4.1", "gpt-_._") is True
+    assert _like_match("gpt-4x1", "gpt-4.1") is False  # "." is literal
+    assert _like_match("line\nbreak", "line%") is True
+
     assert _set_field({"items": []}, "items[2]", "x") == {"items": [None, None, "x"]}
     assert _set_field([], "1.name", "nya") == [{}, {"name": "nya"}]
     assert _set_field({"a": 1}, ".", "ignored") == {"a": 1}
     assert _set_field({"items": []}, "items.name.value", "x") == {"items": []}
+    segments = _split_path("items[0]." + "".join(["na", "me"]))
+    assert segments == ("items", "0", "name")
+    assert segments[2] is sys.intern("name")
 
     assert _remove_field({"items": ["a", "b"]}, "items[1]") == {"items": ["a"]}
     assert _remove_field({"items": ["a"]}, "items.name") == {"items": ["a"]}
@@ -260,13 +325,83 @@ def test_private_helpers_cover_navigation_and_error_edges(monkeypatch):
     assert _process_value_references("${{[}}", {"a": 1}) is None
     assert _process_value_references("plain", {"a": 1}) == "plain"
 
-    def broken_sub(*args, **kwargs):
-        raise RuntimeError("regex broke")
+    class BrokenPattern:
+        def sub(self, *args, **kwargs):
+            raise RuntimeError("regex broke")
 
-    monkeypatch.setattr("nya.utils.substitution.re.sub", broken_sub)
+    monkeypatch.setattr("nya.utils.substitution._REFERENCE_PATTERN", BrokenPattern())
     assert _process_value_references("x ${{a}}", {"a": 1}) == "x ${{a}}"
 
 
+def test_identical_condition_lists_share_one_compilation():
+    conditions = [{"field": "a.b", "operator": "in", "value": [1, 2]}]
+    same = [{"value": [1, 2], "operator": "in", "field": "a.b"}]
+
+    assert _compiled_conditions(conditions) is _compiled_conditions(same)
+    assert _check_rule_conditions({"a": {"b": 2}}, same) is True
+    assert _check_rule_conditions({"a": {"b": 3}}, same) is False
+
+    # Values are keyed exactly, so lossy JSON spellings never collide
+    assert _check_rule_conditions(
+        {"a": 1}, [{"field": "a", "operator": "lt", "value": float("inf")}]
+    )
+    assert not _check_rule_conditions(
+        {}, [{"field": "a", "operator": "eq", "value": float("nan")}]
+    )
+    assert not _check_rule_conditions(
+        {"a": [1]}, [{"field": "a", "operator": "eq", "value": (1,)}]
+    )
+    assert _check_rule_conditions(
+        {"a": [1]}, [{"field": "a", "operator": "eq", "value": [1]}]
+    )
+
+    marker = object()
+    assert _check_rule_conditions(
+        {"a": 1}, [{"field": "a", "operator": "ne", "value": marker}]
+    )
+
+    # Values that cannot be keyed still work, just without the cache
+    assert _check_rule_conditions(
+        {"a": 1}, [{"field": "a", "operator": "ne", "value": {1}}]
+    )
+
+
+def test_repeated_checks_of_one_list_skip_building_its_key(monkeypatch):
+    # The per-request path must not rebuild the exact value key; it is only
+    # needed the first time a condition list is seen
+    conditions = [{"field": "a", "operator": "eq", "value": 1}]
+    keyed = []
+
+    def counting_key(value):
+        keyed.append(value)
+        return _condition_key(value)
+
+    monkeypatch.setattr("nya.utils.substitution._condition_key", counting_key)
+    for _ in range(3):
+        assert _check_rule_conditions({"a": 1}, conditions)
+
+    assert sum(value is conditions for value in keyed) == 1
+
+
+def test_conditions_on_one_field_resolve_it_once():
+    class CountingBody(dict):
+        lookups = 0
+
+        def get(self, key, default=None):
+            CountingBody.lookups += 1
+            return super().get(key, default)
+
+    body = CountingBody(n=5)
+    conditions = [
+        {"field": "n", "operator": "gt", "value": 1},
+        {"field": "n", "operator": "lt", "value": 10},
+        {"field": "n", "operator": "notnull"},
+    ]
+
+    assert _check_rule_conditions(body, conditions) is True
+    assert CountingBody.lookups == 1
+
+
 def test_apply_continues_when_operation_raises(monkeypatch):
     def broken_set(*args, **kwargs):
         raise RuntimeError("set failed")
@@ -1,3 +1,6 @@
+import json
+from datetime import datetime
+
 import pytest
 from httpx import Headers
 
@@ -50,6 +53,31 @@ def test_header_utils_templates_filter_and_merge_headers():
     assert "connection" not in processed
 
 
+def test_header_utils_templates_override_originals_case_insensitively():
+    processed = HeaderUtils.process_headers(
+        {"x-model": "${{ model }}", "X-Missing": "v=${{ absent }}"},
+        {"model": "small"},
+        original_headers={"X-Model": "large", "Accept": "*/*"},
+    )
+
+    assert processed.multi_items() == [
+        ("x-model", "small"),
+        ("accept", "*/*"),
+        ("x-missing", "v=${{ absent }}"),
+    ]
+    assert list(processed.raw)[0][0] == b"x-model"
+
+
+def test_header_utils_substitutes_repeated_and_adjacent_variables():
+    assert (
+        HeaderUtils._substitute_variables(
+            "${{a}}${{ b }}-${{a}}/${{c}}", {"a": "x", "b": ["y", "z"]}
+        )
+        == "xy-x/${{c}}"
+    )
+    assert HeaderUtils._substitute_variables("plain", {}) == "plain"
+
+
 def test_header_utils_trusted_proxy_cidrs():
     assert HeaderUtils.is_trusted_proxy("10.1.2.3", ["10.0.0.0/8"]) is True
     assert HeaderUtils.is_trusted_proxy("2001:db8::1", ["2001:db8::/32"]) is True
@@ -69,6 +97,21 @@ def test_proxy_request_ordering_and_helpers():
         json_safe_dumps({"payload": b'{"ok":true}'}, indent=None)
         == '{"payload": {"ok": true}}'
     )
+    nested = {"payload": b'{"ok":true}', 200: [1.5, None]}
+    decoded = {"payload": {"ok": True}, 200: [1.5, None]}
+    # The default layout is the stdlib's four-space indentation
+    assert json_safe_dumps(nested) == json.dumps(decoded, indent=4)
+    assert json_safe_dumps(nested, indent=2) == json.dumps(decoded, indent=2)
+    assert json_safe_dumps({"n": 2**70}, indent=2) == json.dumps({"n": 2**70}, indent=2)
+    # Types orjson would encode natively fall back like the stdlib path
+    when = datetime(2020, 1, 1)
+    assert json_safe_dumps({"at": when}, indent=2) == str({"at": when})
+    # Documented difference of the two-space path: non-finite floats are null
+    assert json_safe_dumps([float("nan")], indent=2) == "[\n  null\n]"
+    assert json_safe_dumps([float("nan")]) == "[\n    NaN\n]"
+    assert json_safe_dumps({"name": "ñya"}, indent=None, ensure_ascii=True) == (
+        '{"name": "\\u00f1ya"}'
+    )
     assert json_safe_dumps({"payload": b"\xff"}, indent=None).startswith("{")
     assert json_safe_dumps(object()).startswith("<object object")
     assert format_elapsed_time(0.000001).endswith("μs")